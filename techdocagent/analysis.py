@@ -2,6 +2,7 @@
 analysis.py
 Module for code analysis: detects programming language and extracts code structure.
 """
+import functools
 import os
 from pathlib import Path
 
@@ -34,20 +35,27 @@ EXTENSION_LANGUAGE_MAP = {
     '.yaml': 'YAML',
 }
 
-def detect_language(file_path):
-    ext = Path(file_path).suffix.lower()
+@functools.lru_cache(maxsize=64)
+def _language_for_extension(ext):
+    """Cached extension -> language lookup; distinct extensions are few."""
     return EXTENSION_LANGUAGE_MAP.get(ext, 'Unknown')
 
-def analyze_file(file_path):
+def detect_language(file_path):
+    # os.path.splitext skips Path object construction in this per-file hot path
+    return _language_for_extension(os.path.splitext(file_path)[1].lower())
+
+def analyze_file(file_path, stat_result=None):
     """
     Detect the programming language and extract code structure from the given file.
+    Accepts an optional stat_result (e.g. cached from the ingestion scandir walk)
+    to avoid re-issuing a stat syscall.
     Returns language and structure metadata.
     """
     language = detect_language(file_path)
-    file_stats = os.stat(file_path)
+    file_stats = stat_result if stat_result is not None else os.stat(file_path)
     metadata = {
         'file_path': str(file_path),
-        'file_name': Path(file_path).name,
+        'file_name': os.path.basename(file_path),
         'size_bytes': file_stats.st_size,
         'language': language,
     }
@@ -0,0 +1,103 @@
+"""
+cache.py
+Module for the incremental chunk cache: persists chunk results keyed on file content hash so unchanged files are not re-chunked across runs.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+
+from techdocagent.chunking import Chunks
+
+DEFAULT_CACHE_DIR = '.techdoc_cache'
+
+
+def content_hash(content):
+    """Hash of file content used as the chunk cache key (blake2b, 128-bit)."""
+    return hashlib.blake2b(content.encode('utf-8', errors='replace'), digest_size=16).hexdigest()
+
+
+class ChunkCache:
+    """
+    SQLite-backed cache of chunk_code results.
+
+    Chunks are stored keyed by content hash, and a per-path (mtime_ns, size)
+    record lets unchanged files be served from the cache without even being
+    re-read or re-hashed.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db_path = os.path.join(cache_dir, 'chunks.db')
+        self.conn = sqlite3.connect(self.db_path)
+        self._initialize_schema()
+
+    def _initialize_schema(self):
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS chunks (
+                content_hash TEXT PRIMARY KEY,
+                chunks_json TEXT NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                file_path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                content_hash TEXT NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def get_by_stat(self, file_path, stat_result):
+        """
+        Return cached chunks if the file's (mtime_ns, size) is unchanged since
+        it was stored, without reading the file. Returns None on miss.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT c.chunks_json FROM files f
+            JOIN chunks c ON c.content_hash = f.content_hash
+            WHERE f.file_path = ? AND f.mtime_ns = ? AND f.size = ?
+        """, (file_path, stat_result.st_mtime_ns, stat_result.st_size))
+        row = cursor.fetchone()
+        return Chunks.from_dicts(json.loads(row[0])) if row else None
+
+    def get_by_hash(self, chunk_key):
+        """Return cached chunks for a content hash, or None on miss."""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT chunks_json FROM chunks WHERE content_hash = ?", (chunk_key,))
+        row = cursor.fetchone()
+        return Chunks.from_dicts(json.loads(row[0])) if row else None
+
+    def store(self, file_path, stat_result, chunk_key, chunks):
+        """Store chunks for a content hash and record the file's stat fingerprint."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            INSERT OR REPLACE INTO chunks (content_hash, chunks_json) VALUES (?, ?)
+        """, (chunk_key, json.dumps(chunks.to_dicts())))
+        cursor.execute("""
+            INSERT OR REPLACE INTO files (file_path, mtime_ns, size, content_hash)
+            VALUES (?, ?, ?, ?)
+        """, (file_path, stat_result.st_mtime_ns, stat_result.st_size, chunk_key))
+        self.conn.commit()
+
+    def touch(self, file_path, stat_result, chunk_key):
+        """Refresh a file's stat fingerprint after a hash-level cache hit."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            INSERT OR REPLACE INTO files (file_path, mtime_ns, size, content_hash)
+            VALUES (?, ?, ?, ?)
+        """, (file_path, stat_result.st_mtime_ns, stat_result.st_size, chunk_key))
+        self.conn.commit()
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
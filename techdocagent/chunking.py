@@ -2,50 +2,181 @@
 chunking.py
 Module for code chunking: splits code into logical chunks (functions, classes, modules, etc.).
 """
+import ast
+import bisect
+import functools
 import re
+from collections.abc import Mapping, Sequence
+
+# Compiled once at import so per-file chunking pays no regex compilation cost
+_PY_DEF_CLASS_RE = re.compile(r'^(def|class)\s+(\w+)\s*\(?.*\)?:', re.MULTILINE)
+
+# Patterns per language; cached so each compiles exactly once per process
+_LANGUAGE_PATTERNS = {
+    'Python': r'^(def|class)\s+(\w+)\s*\(?.*\)?:',
+}
+
+@functools.lru_cache(maxsize=None)
+def _get_lang_pattern(language):
+    """Return the compiled chunking pattern for a language, or None if unsupported."""
+    pattern = _LANGUAGE_PATTERNS.get(language)
+    return re.compile(pattern, re.MULTILINE) if pattern else None
+
+_CHUNK_FIELDS = ('type', 'name', 'start_line', 'end_line', 'code')
+
+class _ChunkView(Mapping):
+    """Read-only mapping over one row of a Chunks container."""
+    __slots__ = ('_chunks', '_index')
+
+    def __init__(self, chunks, index):
+        self._chunks = chunks
+        self._index = index
+
+    def __getitem__(self, key):
+        if key not in _CHUNK_FIELDS:
+            raise KeyError(key)
+        return getattr(self._chunks, key + 's')[self._index]
+
+    def __iter__(self):
+        return iter(_CHUNK_FIELDS)
+
+    def __len__(self):
+        return len(_CHUNK_FIELDS)
+
+class Chunks(Sequence):
+    """
+    Columnar (struct-of-arrays) container for chunk metadata.
+
+    Keeps one list per field instead of one dict per chunk, cutting the
+    per-chunk dict overhead on large codebases. Iterating or indexing yields
+    mapping views, so consumers keep using chunk['type'], chunk.get('name'),
+    etc. as with the previous list-of-dicts layout.
+    """
+    __slots__ = ('types', 'names', 'start_lines', 'end_lines', 'codes')
+
+    def __init__(self):
+        self.types = []
+        self.names = []
+        self.start_lines = []
+        self.end_lines = []
+        self.codes = []
+
+    def append(self, chunk_type, name, start_line, end_line, code):
+        self.types.append(chunk_type)
+        self.names.append(name)
+        self.start_lines.append(start_line)
+        self.end_lines.append(end_line)
+        self.codes.append(code)
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return _ChunkView(self, index)
+
+    def to_dicts(self):
+        """Materialize as a plain list of dicts (e.g. for JSON serialization)."""
+        return [dict(view) for view in self]
+
+    @classmethod
+    def from_dicts(cls, dicts):
+        """Rebuild a Chunks container from a list of chunk dicts."""
+        chunks = cls()
+        for chunk in dicts:
+            chunks.append(chunk['type'], chunk['name'], chunk['start_line'],
+                          chunk['end_line'], chunk['code'])
+        return chunks
+
+# Above this size a vectorized NumPy scan beats the pure-Python loop
+_NUMPY_NEWLINE_THRESHOLD = 65536
+
+def _newline_positions(file_content):
+    """Return the offsets of all newlines in file_content, in ascending order."""
+    if len(file_content) > _NUMPY_NEWLINE_THRESHOLD and file_content.isascii():
+        # ASCII only: byte offsets and str offsets coincide, so the C-level
+        # scan can stand in for the Python loop. Import lazily so small-file
+        # runs never pay NumPy's import cost.
+        import numpy as np
+        buf = np.frombuffer(file_content.encode('ascii'), dtype=np.uint8)
+        return np.flatnonzero(buf == 0x0A).tolist()
+    positions = []
+    find = file_content.find
+    pos = find('\n')
+    while pos != -1:
+        positions.append(pos)
+        pos = find('\n', pos + 1)
+    return positions
+
+def _line_count(file_content, nl_positions=None):
+    """Number of lines without materializing a line list."""
+    if not file_content:
+        return 0
+    newlines = len(nl_positions) if nl_positions is not None else file_content.count('\n')
+    return newlines + (0 if file_content.endswith('\n') else 1)
+
+def _chunk_python_ast(file_content):
+    """
+    Chunk Python source with ast.parse: exact function/class boundaries in one
+    C-level pass, no newline counting. Raises SyntaxError on invalid source.
+    """
+    tree = ast.parse(file_content)
+    nodes = [node for node in ast.iter_child_nodes(tree)
+             if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))]
+    chunks = Chunks()
+    if not nodes:
+        return chunks
+    nl_positions = _newline_positions(file_content)
+    for node in nodes:
+        start_line = node.lineno
+        end_line = node.end_lineno
+        byte_start = 0 if start_line == 1 else nl_positions[start_line - 2] + 1
+        byte_end = nl_positions[end_line - 1] if end_line <= len(nl_positions) else len(file_content)
+        chunks.append('class' if isinstance(node, ast.ClassDef) else 'def',
+                      node.name, start_line, end_line,
+                      file_content[byte_start:byte_end])
+    return chunks
 
 def chunk_code(file_content, language):
     """
     Split code into logical chunks based on language.
-    Returns a list of code chunks with metadata.
+    Python files are split on exact AST boundaries, falling back to the regex
+    chunker when the source does not parse.
+    Returns a Chunks container of code chunks with metadata.
     """
-    chunks = []
-    lines = file_content.splitlines()
+    chunks = Chunks()
+    matches = []
     if language == 'Python':
-        pattern = re.compile(r'^(def|class)\s+(\w+)\s*\(?.*\)?:', re.MULTILINE)
-        matches = list(pattern.finditer(file_content))
+        try:
+            chunks = _chunk_python_ast(file_content)
+            if chunks:
+                return chunks
+        except (SyntaxError, ValueError):
+            # Unparseable source (or null bytes): fall back to the regex chunker
+            matches = list(_PY_DEF_CLASS_RE.finditer(file_content))
+    if matches:
+        # One newline scan up front; offsets -> line numbers via binary search,
+        # and chunk code comes from direct slices instead of splitlines + join
+        nl_positions = _newline_positions(file_content)
+        total_lines = _line_count(file_content, nl_positions)
         for i, match in enumerate(matches):
             chunk_type = match.group(1)
             name = match.group(2)
-            start_line = file_content[:match.start()].count('\n') + 1
+            start_line = bisect.bisect_left(nl_positions, match.start()) + 1
             if i + 1 < len(matches):
-                end_line = file_content[:matches[i+1].start()].count('\n')
+                end_line = bisect.bisect_left(nl_positions, matches[i+1].start())
             else:
-                end_line = len(lines)
-            code = '\n'.join(lines[start_line-1:end_line])
-            chunks.append({
-                'type': chunk_type,
-                'name': name,
-                'start_line': start_line,
-                'end_line': end_line,
-                'code': code
-            })
-        if not matches:
-            # No functions/classes found, treat whole file as one chunk
-            chunks.append({
-                'type': 'file',
-                'name': None,
-                'start_line': 1,
-                'end_line': len(lines),
-                'code': file_content
-            })
+                end_line = total_lines
+            byte_start = 0 if start_line == 1 else nl_positions[start_line - 2] + 1
+            byte_end = nl_positions[end_line - 1] if end_line <= len(nl_positions) else len(file_content)
+            chunks.append(chunk_type, name, start_line, end_line,
+                          file_content[byte_start:byte_end])
     else:
-        # For other languages, treat the whole file as a single chunk
-        chunks.append({
-            'type': 'file',
-            'name': None,
-            'start_line': 1,
-            'end_line': len(lines),
-            'code': file_content
-        })
-    return chunks 
\ No newline at end of file
+        # No functions/classes found (or non-Python): whole file is one chunk
+        chunks.append('file', None, 1, _line_count(file_content), file_content)
+    return chunks
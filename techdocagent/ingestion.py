@@ -4,13 +4,21 @@ Module for codebase ingestion: recursively scans directories, filters code files
 """
 
 import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import pathspec
 
 # Default set of code file extensions (can be expanded)
-CODE_EXTENSIONS = {
+CODE_EXTENSIONS = frozenset({
     '.py', '.js', '.ts', '.java', '.c', '.cpp', '.cs', '.go', '.rb', '.php', '.rs', '.swift', '.kt', '.m', '.scala', '.sh', '.pl', '.lua', '.dart', '.html', '.css', '.json', '.xml', '.yml', '.yaml'
-}
+})
+
+# Only fan a directory out to the pool when it has enough subdirectories to
+# amortize the submission overhead; small directories recurse inline.
+_PARALLEL_SUBDIR_THRESHOLD = 4
+_MAX_WALK_WORKERS = min(32, (os.cpu_count() or 1) * 4)
 
 def load_gitignore(root_path):
     gitignore_path = Path(root_path) / '.gitignore'
@@ -19,25 +27,222 @@ def load_gitignore(root_path):
             return pathspec.PathSpec.from_lines('gitwildmatch', f)
     return None
 
+def _combined_gitignore_matcher(spec):
+    """
+    Combine all gitignore pattern regexes into one compiled regex so each path
+    is tested with a single match instead of one per pattern. Specs containing
+    negated patterns are declined: gitignore resolves them by last-match-wins
+    ordering, which a single union regex cannot express. Returns None if the
+    patterns cannot be combined, in which case callers fall back to
+    spec.match_file.
+    """
+    positives = []
+    for pattern in spec.patterns:
+        if pattern.regex is None or pattern.include is None:
+            continue
+        if not pattern.include:
+            return None
+        # Strip the named directory-marker group so patterns can be unioned
+        regex = pattern.regex.pattern.replace('(?P<ps_d>', '(?:')
+        positives.append('(?:%s)' % regex)
+    if not positives:
+        return None
+    try:
+        return re.compile('|'.join(positives)).match
+    except re.error:
+        return None
+
+def _rebase_nested_patterns(lines, rel_dir):
+    """
+    Rewrite patterns from a nested .gitignore so they keep their meaning when
+    matched against root-relative paths. Patterns containing a non-trailing
+    slash are anchored to the .gitignore's own directory, so they get the
+    subdirectory path prefixed; unanchored patterns match at any depth below
+    it, expressed with a '**/' segment.
+    """
+    rebased = []
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        negated = stripped.startswith('!')
+        if negated:
+            stripped = stripped[1:]
+        if '/' in stripped.rstrip('/'):
+            stripped = rel_dir + '/' + stripped.lstrip('/')
+        else:
+            stripped = rel_dir + '/**/' + stripped
+        rebased.append('!' + stripped if negated else stripped)
+    return rebased
+
+_GLOB_CHARS = '*?[]!'
+_EXT_PATTERN_RE = re.compile(r'^\*(\.[A-Za-z0-9]+)$')
+
+def _extract_literal_rules(spec):
+    """
+    Peel cheap-to-match patterns out of a gitignore spec so the hot path does
+    O(1) checks instead of per-pattern matching. Bare directory names
+    (e.g. 'node_modules/') go into a name set matched at any depth; anchored
+    paths (e.g. 'build/sub/') into a prefix trie walked component by
+    component; simple '*.ext' rules into an extension set. Returns
+    (names, trie, extensions, remainder_spec). Left untouched when the spec
+    has negations, since those may re-include extracted paths.
+    """
+    if spec is None or any(p.include is False for p in spec.patterns):
+        return frozenset(), {}, frozenset(), spec
+    names = set()
+    trie = {}
+    extensions = set()
+    remainder = []
+    for pattern in spec.patterns:
+        text = (getattr(pattern, 'pattern', '') or '').strip()
+        if pattern.include and text.endswith('/') and not any(c in text for c in _GLOB_CHARS):
+            inner = text.strip('/')
+            if '/' not in inner:
+                names.add(inner)
+            else:
+                node = trie
+                for component in inner.split('/'):
+                    node = node.setdefault(component, {})
+                node[''] = True  # terminal marker
+            continue
+        ext_match = _EXT_PATTERN_RE.match(text)
+        if pattern.include and ext_match:
+            extensions.add(ext_match.group(1).lower())
+            continue
+        remainder.append(pattern)
+    if names or trie or extensions:
+        spec = pathspec.PathSpec(remainder) if remainder else None
+    return frozenset(names), trie, frozenset(extensions), spec
+
 def ingest_codebase(root_path):
     """
     Recursively scan the root_path, filter code files by extension, and respect .gitignore.
     Returns a list of code file paths.
     """
+    return [path for path, _ in ingest_codebase_entries(root_path)]
+
+def ingest_codebase_entries(root_path):
+    """
+    Like ingest_codebase, but returns (path, stat_result) tuples. The stat results
+    come from the scandir walk (cached by the OS), so callers can reuse them
+    instead of re-issuing a stat syscall per file.
+    Directory scans are submitted to a thread pool so stat/scandir calls overlap I/O latency.
+    """
     root = Path(root_path)
-    spec = load_gitignore(root)
+    # Literal directory rules from the root .gitignore prune subtrees before
+    # any regex matching; remaining patterns keep the normal matcher path
+    ignored_dir_names, ignore_trie, ignored_exts, root_spec = _extract_literal_rules(load_gitignore(root))
     code_files = []
-    for dirpath, dirnames, filenames in os.walk(root):
-        rel_dir = os.path.relpath(dirpath, root)
-        # Skip ignored directories
-        if spec and rel_dir != '.' and spec.match_file(rel_dir + '/'):  # Add trailing slash for directories
-            dirnames[:] = []  # Don't recurse into this directory
-            continue
-        for filename in filenames:
-            file_path = Path(dirpath) / filename
-            rel_file = os.path.relpath(file_path, root)
-            if spec and spec.match_file(rel_file):
-                continue
-            if file_path.suffix.lower() in CODE_EXTENSIONS:
-                code_files.append(str(file_path))
-    return code_files 
\ No newline at end of file
+    results_lock = threading.Lock()
+    futures = []
+    futures_lock = threading.Lock()
+    # Single-run cache of (spec, matcher) per directory so nested .gitignore
+    # files are parsed at most once and inherited by child directories
+    spec_cache = {}
+    spec_lock = threading.Lock()
+
+    def _dir_state(dir_path, rel_dir, parent_spec):
+        """Return (spec, matcher) in effect for dir_path, loading and merging
+        a local .gitignore with the parent's spec on first visit. Local
+        patterns are rebased onto the directory so they still anchor there
+        when matched against root-relative paths."""
+        with spec_lock:
+            if dir_path in spec_cache:
+                return spec_cache[dir_path]
+        try:
+            with open(os.path.join(dir_path, '.gitignore'), 'r') as f:
+                lines = f.read().splitlines()
+            if rel_dir:
+                lines = _rebase_nested_patterns(lines, rel_dir)
+            local = pathspec.PathSpec.from_lines('gitwildmatch', lines)
+            if parent_spec:
+                spec = pathspec.PathSpec(list(parent_spec.patterns) + list(local.patterns))
+            else:
+                spec = local
+        except OSError:
+            spec = parent_spec
+        if spec:
+            matcher = _combined_gitignore_matcher(spec) or spec.match_file
+        else:
+            matcher = None
+        state = (spec, matcher)
+        with spec_lock:
+            spec_cache[dir_path] = state
+        return state
+
+    if root_spec:
+        root_matcher = _combined_gitignore_matcher(root_spec) or root_spec.match_file
+    else:
+        root_matcher = None
+    spec_cache[str(root)] = (root_spec, root_matcher)
+
+    with ThreadPoolExecutor(max_workers=_MAX_WALK_WORKERS) as executor:
+
+        def _scan(dir_path, rel_dir, parent_spec, trie_node):
+            spec, match_ignored = _dir_state(dir_path, rel_dir, parent_spec)
+            found = []
+            subdirs = []
+            try:
+                entries = os.scandir(dir_path)
+            except OSError:
+                return
+            with entries:
+                for entry in entries:
+                    rel_path = entry.name if not rel_dir else rel_dir + '/' + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        # Literal rules first: O(1) set/trie checks prune
+                        # whole subtrees without touching the regex matcher
+                        if entry.name in ignored_dir_names:
+                            continue
+                        child_trie = trie_node.get(entry.name) if trie_node else None
+                        if child_trie is not None and '' in child_trie:
+                            continue
+                        # Add trailing slash so directory patterns match
+                        if match_ignored and match_ignored(rel_path + '/'):
+                            continue
+                        subdirs.append((entry.path, rel_path, child_trie))
+                    else:
+                        # Extension check first: a plain string slice is cheaper
+                        # than any gitignore matching
+                        name = entry.name
+                        dot = name.rfind('.')
+                        if dot <= 0:
+                            continue
+                        ext = name[dot:].lower()
+                        if ext not in CODE_EXTENSIONS or ext in ignored_exts:
+                            continue
+                        if match_ignored and match_ignored(rel_path):
+                            continue
+                        try:
+                            # Normalize so a relative root ('.') yields
+                            # 'main.py', not './main.py' — git-derived paths
+                            # in ChangeDetector use the normalized spelling.
+                            # Follow symlinks: consumers want the target's
+                            # size and mtime, not the link's
+                            found.append((os.path.normpath(entry.path),
+                                          entry.stat()))
+                        except OSError:
+                            continue
+            if found:
+                with results_lock:
+                    code_files.extend(found)
+            if len(subdirs) > _PARALLEL_SUBDIR_THRESHOLD:
+                submitted = [executor.submit(_scan, path, rel, spec, child)
+                             for path, rel, child in subdirs]
+                with futures_lock:
+                    futures.extend(submitted)
+            else:
+                for path, rel, child in subdirs:
+                    _scan(path, rel, spec, child)
+
+        _scan(str(root), '', None, ignore_trie)
+        # Drain until no scan task has submitted new work
+        while True:
+            with futures_lock:
+                pending, futures[:] = futures[:], []
+            if not pending:
+                break
+            for future in pending:
+                future.result()
+    return code_files
@@ -2,6 +2,7 @@
 llm.py
 Module for LLM integration: calls Gemini API for documentation generation using the official google-genai library (v1.x+).
 """
+import asyncio
 import os
 from dotenv import load_dotenv
 from google import genai
@@ -10,17 +11,56 @@ load_dotenv()
 
 MODEL_NAME = "gemini-2.5-flash"
 
+_client = None
+
+def _get_client():
+    """
+    Return the shared Gemini client, creating it on first use.
+    Reusing one client keeps HTTP connection pooling effective across calls.
+    """
+    global _client
+    if _client is None:
+        api_key = os.environ.get("GOOGLE_API_KEY")
+        if not api_key:
+            raise ValueError("GOOGLE_API_KEY environment variable not set.")
+        _client = genai.Client(api_key=api_key)
+    return _client
+
 def generate_documentation(prompt):
     """
     Call the Gemini API with the given prompt and return the generated documentation.
     Requires GOOGLE_API_KEY in environment variables.
     """
-    api_key = os.environ.get("GOOGLE_API_KEY")
-    if not api_key:
-        raise ValueError("GOOGLE_API_KEY environment variable not set.")
-    client = genai.Client(api_key=api_key)
-    response = client.models.generate_content(
+    response = _get_client().models.generate_content(
+        model=MODEL_NAME,
+        contents=prompt
+    )
+    return response.text
+
+async def generate_documentation_async(prompt):
+    """
+    Async variant of generate_documentation, using the shared client's async API.
+    """
+    response = await _get_client().aio.models.generate_content(
         model=MODEL_NAME,
         contents=prompt
     )
-    return response.text 
\ No newline at end of file
+    return response.text
+
+def generate_documentation_batch(prompts, max_concurrency=10):
+    """
+    Generate documentation for many prompts concurrently. Calls are network-bound,
+    so they run under asyncio, bounded by a semaphore to respect API rate limits.
+    Returns results in prompt order; a failed call yields its exception in place
+    of the text.
+    """
+    async def _run():
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _one(prompt):
+            async with semaphore:
+                return await generate_documentation_async(prompt)
+
+        return await asyncio.gather(*(_one(p) for p in prompts), return_exceptions=True)
+
+    return asyncio.run(_run()) 
\ No newline at end of file
@@ -2,12 +2,42 @@
 pipeline.py
 High-level pipeline for processing a codebase: ingestion, analysis, and chunking, with JSON-based LLM prompt and output.
 """
-from techdocagent.ingestion import ingest_codebase
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from techdocagent.ingestion import ingest_codebase, ingest_codebase_entries
 from techdocagent.analysis import analyze_file
+from techdocagent.cache import ChunkCache, DEFAULT_CACHE_DIR, content_hash
 from techdocagent.chunking import chunk_code
 # from techdocagent.prompts import build_json_prompt, build_llm_prompt_json_in_json_out, parse_llm_json_output
 from techdocagent.llm import generate_documentation
 
+_READ_WORKERS = 16
+# Below this many files, process startup costs more than parallel chunking saves
+_PROCESS_CHUNK_MIN_FILES = 64
+# Files handed to each worker task; keeps pickling overhead amortized
+_PROCESS_CHUNKSIZE = 32
+# Files held in memory at once when streaming; bounds peak memory
+_STREAM_BATCH_FILES = 256
+# Files larger than this (vendored blobs, minified bundles) are skipped outright
+_MAX_FILE_BYTES = 2 * 1024 * 1024
+# Marker for files dropped by the binary sniff
+_SKIPPED = object()
+
+
+def _read_file(file_path):
+    """
+    Read a source file's content; I/O-bound, so safe to run on a thread pool.
+    Returns None for files whose leading bytes look binary.
+    """
+    # Unbuffered binary read: the whole file in one read() syscall with no
+    # buffered-IO wrapper, then a single C-level decode
+    with open(file_path, 'rb', buffering=0) as f:
+        data = f.read()
+    if b'\x00' in data[:512]:
+        return None
+    return data.decode('utf-8', errors='replace')
+
 
 def process_codebase(root_path):
     """
@@ -15,20 +45,80 @@ def process_codebase(root_path):
       - Ingest code files
       - Analyze each file for language and metadata
       - Chunk each file into logical code units
+    File contents are read in parallel on a thread pool; the CPU-bound
+    regex chunking is dispatched across processes for large codebases.
     Returns a list of dicts with file metadata and code chunks.
     """
-    code_files = ingest_codebase(root_path)
-    results = []
-    for file_path in code_files:
-        metadata = analyze_file(file_path)
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        chunks = chunk_code(content, metadata['language'])
-        results.append({
-            'file_metadata': metadata,
-            'chunks': chunks
-        })
-    return results
+    return list(iter_codebase(root_path))
+
+
+def iter_codebase(root_path, batch_size=_STREAM_BATCH_FILES, use_cache=True):
+    """
+    Streaming variant of process_codebase: yields one result dict per file.
+    Files are read and chunked in bounded batches, so peak memory stays
+    proportional to batch_size instead of the whole repository.
+    Chunk results are persisted (keyed on content hash) in .techdoc_cache, so
+    unchanged files short-circuit on re-runs; an (mtime, size) match skips
+    the read entirely.
+    """
+    entries = ingest_codebase_entries(root_path)
+    # The cached stat already tells us which files are too big to bother with
+    entries = [(path, stat) for path, stat in entries if stat.st_size <= _MAX_FILE_BYTES]
+    # Root the cache under the scanned tree, not wherever the process runs
+    cache = ChunkCache(os.path.join(root_path, DEFAULT_CACHE_DIR)) if use_cache else None
+    chunk_pool = ProcessPoolExecutor() if len(entries) >= _PROCESS_CHUNK_MIN_FILES else None
+    try:
+        with ThreadPoolExecutor(max_workers=_READ_WORKERS) as reader:
+            for start in range(0, len(entries), batch_size):
+                batch = entries[start:start + batch_size]
+                metadatas = [analyze_file(path, stat_result=stat) for path, stat in batch]
+                chunks_per_file = [None] * len(batch)
+                to_read = []
+                for idx, (path, stat) in enumerate(batch):
+                    if cache:
+                        hit = cache.get_by_stat(path, stat)
+                        if hit is not None:
+                            chunks_per_file[idx] = hit
+                            continue
+                    to_read.append(idx)
+                contents = list(reader.map(_read_file, [batch[i][0] for i in to_read]))
+                to_chunk = []
+                hashes = [None] * len(to_read)
+                for pos, idx in enumerate(to_read):
+                    if contents[pos] is None:
+                        chunks_per_file[idx] = _SKIPPED
+                        continue
+                    if cache:
+                        hashes[pos] = content_hash(contents[pos])
+                        hit = cache.get_by_hash(hashes[pos])
+                        if hit is not None:
+                            # Content unchanged under a new mtime (e.g. touch)
+                            cache.touch(batch[idx][0], batch[idx][1], hashes[pos])
+                            chunks_per_file[idx] = hit
+                            continue
+                    to_chunk.append(pos)
+                chunk_contents = [contents[pos] for pos in to_chunk]
+                chunk_languages = [metadatas[to_read[pos]]['language'] for pos in to_chunk]
+                if chunk_pool is not None:
+                    chunked = list(chunk_pool.map(
+                        chunk_code, chunk_contents, chunk_languages, chunksize=_PROCESS_CHUNKSIZE))
+                else:
+                    chunked = [chunk_code(content, language)
+                               for content, language in zip(chunk_contents, chunk_languages)]
+                for pos, chunks in zip(to_chunk, chunked):
+                    idx = to_read[pos]
+                    chunks_per_file[idx] = chunks
+                    if cache:
+                        cache.store(batch[idx][0], batch[idx][1], hashes[pos], chunks)
+                for metadata, chunks in zip(metadatas, chunks_per_file):
+                    if chunks is _SKIPPED:
+                        continue
+                    yield {'file_metadata': metadata, 'chunks': chunks}
+    finally:
+        if chunk_pool is not None:
+            chunk_pool.shutdown()
+        if cache is not None:
+            cache.close()
 
 
 def process_codebase_json(root_path, project_name="Project", project_description="A codebase."):
@@ -41,17 +131,7 @@ def process_codebase_json(root_path, project_name="Project", project_description
       - Send the prompt to the LLM and parse the JSON output
     Returns the parsed JSON result from the LLM.
     """
-    code_files = ingest_codebase(root_path)
-    results = []
-    for file_path in code_files:
-        metadata = analyze_file(file_path)
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        chunks = chunk_code(content, metadata['language'])
-        results.append({
-            'file_metadata': metadata,
-            'chunks': chunks
-        })
+    results = process_codebase(root_path)
     # Build JSON prompt
     prompt_json = build_json_prompt(results, project_name=project_name, project_description=project_description)
     llm_prompt = build_llm_prompt_json_in_json_out(prompt_json)
@@ -1,6 +1,13 @@
+import hashlib
+import mmap
 import os
+import re
 import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import cached_property, lru_cache
 from pathlib import Path
+
+import numpy as np
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
@@ -28,6 +35,46 @@ from .config import AgentConfig, ConfigManager
 
 import google.generativeai as genai
 
+# Potential-secret patterns, compiled once as a single alternation so
+# post-processing scans the documentation in one pass
+_SECRET_RE = re.compile(r'sk-[a-zA-Z0-9]{48}|AIza[a-zA-Z0-9_-]{35}|[a-zA-Z0-9]{32,}')
+
+# Files at least this large are read through mmap instead of read()
+_MMAP_MIN_BYTES = 64 * 1024
+
+_UPDATE_ADDENDUM = """
+
+# Update Context
+The codebase has changed. Here are the changes:
+{changes}
+
+Previous documentation:
+{existing_doc}
+
+Please update the documentation to reflect these changes while preserving the overall structure and style.
+"""
+
+
+@lru_cache(maxsize=16)
+def _update_template(doc_type: str) -> str:
+    """Update template per doc type, concatenated once and reused."""
+    return DocTemplates.get_template(doc_type) + _UPDATE_ADDENDUM
+
+# One analyzer per worker process, built on first task instead of per file
+_worker_analyzer = None
+
+
+def _parse_worker(file_path, content, language):
+    """Extract chunks for one file in a worker process; returns None on error."""
+    global _worker_analyzer
+    try:
+        if _worker_analyzer is None:
+            _worker_analyzer = ASTAnalyzer()
+        return _worker_analyzer.extract_chunks(file_path, content, language)
+    except Exception as e:
+        print(f"Error analyzing {file_path}: {e}")
+        return None
+
 
 class TechDocAgent:
     """
@@ -61,25 +108,58 @@ class TechDocAgent:
         if self.config.gemini_api_key:
             genai.configure(api_key=self.config.gemini_api_key)
 
-        self.memory = MemoryManager(self.config.memory_db_path)
-        self.embeddings = EmbeddingManager(
+        self.session_id = str(uuid.uuid4())
+
+        # (head_commit, file_list) from the last ingestion walk; reused while
+        # the repository head is unchanged
+        self._file_list_cache: Optional[Tuple[Optional[str], List[str]]] = None
+
+        # Per-doc-type search results prefetched by generate_all, consumed by
+        # _gather_context instead of issuing a fresh search
+        self._prefetched_chunks: Dict[str, List] = {}
+
+        print(f"TechDocAgent Advanced initialized (Session: {self.session_id[:8]})")
+
+    # Components are constructed lazily on first use: opening SQLite, loading
+    # the FAISS index, or probing git would otherwise dominate startup even
+    # for calls that never touch them.
+
+    @cached_property
+    def memory(self):
+        memory = MemoryManager(self.config.memory_db_path)
+        memory.create_session(self.session_id, {'started_at': str(datetime.now())})
+        return memory
+
+    @cached_property
+    def embeddings(self):
+        if not self.config.features.get('embeddings', True):
+            return None
+        return EmbeddingManager(
             api_key=self.config.gemini_api_key,
             index_path=self.config.embeddings_path
-        ) if self.config.features.get('embeddings', True) else None
+        )
 
-        self.change_detector = ChangeDetector(
+    @cached_property
+    def change_detector(self):
+        if not self.config.features.get('change_detection', True):
+            return None
+        return ChangeDetector(
             self.config.project_root,
-            self.memory
-        ) if self.config.features.get('change_detection', True) else None
-
-        self.feedback = FeedbackManager(self.memory) if self.config.features.get('feedback_loop', True) else None
-
-        self.ast_analyzer = ASTAnalyzer() if self.config.features.get('ast_analysis', True) else None
+            self.memory,
+            max_workers=self.config.max_workers if self.config.parallel_processing else None
+        )
 
-        self.session_id = str(uuid.uuid4())
-        self.memory.create_session(self.session_id, {'started_at': str(datetime.now())})
+    @cached_property
+    def feedback(self):
+        if not self.config.features.get('feedback_loop', True):
+            return None
+        return FeedbackManager(self.memory)
 
-        print(f"TechDocAgent Advanced initialized (Session: {self.session_id[:8]})")
+    @cached_property
+    def ast_analyzer(self):
+        if not self.config.features.get('ast_analysis', True):
+            return None
+        return ASTAnalyzer()
 
     def analyze_codebase(self, root_path: Optional[str] = None, force_reanalyze: bool = False) -> Dict[str, Any]:
         """
@@ -95,10 +175,7 @@ class TechDocAgent:
         root_path = root_path or self.config.project_root
         print(f"\nAnalyzing codebase: {root_path}")
 
-        if ingest_codebase:
-            code_files = ingest_codebase(root_path)
-        else:
-            code_files = self._fallback_ingest(root_path)
+        code_files = self._ingest_cached(root_path)
 
         print(f"Found {len(code_files)} code files")
 
@@ -113,39 +190,142 @@ class TechDocAgent:
         analyzed_count = 0
         new_chunks_count = 0
 
-        for file_path in code_files:
-            if not force_reanalyze and changes:
-                if not any(c['file_path'] == file_path for c in changes):
+        # Chunks awaiting embedding; flushed in provider-limit batches so the
+        # per-chunk API round-trip is amortized across many chunks
+        pending_chunks = []
+        pending_files = []
+        pending_languages = []
+
+        # Content hashes already indexed this run: duplicated boilerplate
+        # (license headers, vendored copies) is embedded once and its other
+        # occurrences only recorded
+        seen_hashes = set()
+
+        def _flush_pending():
+            """Embed pending chunks, serving repeat content from the persistent cache."""
+            nonlocal pending_chunks, pending_files, pending_languages
+            added = 0
+            miss_chunks, miss_files, miss_languages, miss_hashes = [], [], [], []
+            for chunk, file_path, language in zip(pending_chunks, pending_files, pending_languages):
+                content_hash = hashlib.blake2b(chunk.get('code', '').encode(), digest_size=16).digest()
+                self.memory.link_chunk_to_file(content_hash, file_path)
+                if content_hash in seen_hashes:
                     continue
+                seen_hashes.add(content_hash)
+                cached = self.memory.get_cached_embedding(content_hash)
+                if cached is not None:
+                    self.embeddings.add_chunk_embedding(
+                        chunk, file_path, language,
+                        np.frombuffer(cached, dtype=np.float32).copy())
+                    added += 1
+                else:
+                    miss_chunks.append(chunk)
+                    miss_files.append(file_path)
+                    miss_languages.append(language)
+                    miss_hashes.append(content_hash)
+
+            added_indices = self.embeddings.add_chunks_batch(
+                miss_chunks, miss_files, miss_languages,
+                batch_size=self.config.embed_batch_size
+            )
+            if added_indices:
+                # Freshly embedded vectors sit at the tail of the index, in input order
+                new_vectors = self.embeddings.chunk_embeddings[-len(added_indices):]
+                for i, vector in zip(added_indices, new_vectors):
+                    self.memory.put_cached_embedding(
+                        miss_hashes[i], vector.astype(np.float32).tobytes())
+            added += len(added_indices)
+
+            pending_chunks, pending_files, pending_languages = [], [], []
+            return added
+
+        # Hashed membership test instead of scanning the change list per file
+        changed_set = frozenset(c['file_path'] for c in changes) if changes else None
+        if not force_reanalyze and changed_set is not None:
+            to_analyze = [file_path for file_path in code_files if file_path in changed_set]
+        else:
+            to_analyze = list(code_files)
 
+        def _read_one(file_path):
+            """Read and language-detect one file; runs on the I/O pool."""
             try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
+                size = os.path.getsize(file_path)
+                if size > self.config.max_file_bytes:
+                    print(f"Skipping large file {file_path} ({size} bytes)")
+                    return None
+
+                # One binary read and one decode instead of text-mode
+                # line-by-line UTF-8 handling. Large files are mmapped and
+                # decoded straight from the page-cache-backed view, skipping
+                # the transient bytes copy read() would allocate.
+                with open(file_path, 'rb') as f:
+                    if size >= _MMAP_MIN_BYTES:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            view = memoryview(mm)[:self.config.max_file_bytes]
+                            try:
+                                content = str(view, 'utf-8', 'ignore')
+                            finally:
+                                view.release()
+                    else:
+                        content = f.read(self.config.max_file_bytes).decode('utf-8', errors='ignore')
 
                 language = detect_language(file_path) if detect_language else self._fallback_detect_language(file_path)
+                return file_path, content, language
 
-                if self.ast_analyzer:
-                    chunks = self.ast_analyzer.extract_chunks(file_path, content, language)
-                else:
-                    chunks = self._fallback_chunk(content, language)
+            except Exception as e:
+                print(f"Error analyzing {file_path}: {e}")
+                return None
+
+        # Reads overlap on a thread pool, but the CPU-bound AST parsing fans
+        # out to a process pool: under the GIL, threads cannot scale a pure
+        # parse workload across cores.
+        with ThreadPoolExecutor(max_workers=16) as io_pool:
+            read_results = [r for r in io_pool.map(_read_one, to_analyze) if r is not None]
+
+        if self.ast_analyzer and read_results:
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as cpu_pool:
+                chunk_results = list(cpu_pool.map(
+                    _parse_worker,
+                    [file_path for file_path, _, _ in read_results],
+                    [content for _, content, _ in read_results],
+                    [language for _, _, language in read_results],
+                    chunksize=16
+                ))
+        else:
+            chunk_results = [self._fallback_chunk(content, language)
+                             for _, content, language in read_results]
+
+        # One transaction for the whole run: metadata and cached-embedding
+        # writes share a single commit instead of one fsync per row
+        self.memory.begin_bulk()
+        try:
+            for (file_path, content, language), chunks in zip(read_results, chunk_results):
+                if chunks is None:
+                    continue
 
                 metadata = analyze_file(file_path) if analyze_file else {}
                 self.memory.store_file_metadata(file_path, content, language, metadata)
 
-                if self.embeddings:
+                # Explicit None check: the manager defines __len__, so a
+                # fresh empty index is falsy but must still receive chunks
+                if self.embeddings is not None:
                     for chunk in chunks:
-                        self.embeddings.add_chunk(chunk, file_path, language)
-                        new_chunks_count += 1
+                        pending_chunks.append(chunk)
+                        pending_files.append(file_path)
+                        pending_languages.append(language)
+                    if len(pending_chunks) >= self.config.embed_batch_size:
+                        new_chunks_count += _flush_pending()
 
                 analyzed_count += 1
-
                 if analyzed_count % 10 == 0:
                     print(f"  Analyzed {analyzed_count} files...")
 
-            except Exception as e:
-                print(f"Error analyzing {file_path}: {e}")
+            if self.embeddings is not None and pending_chunks:
+                new_chunks_count += _flush_pending()
+        finally:
+            self.memory.commit_bulk()
 
-        if self.embeddings:
+        if self.embeddings is not None:
             self.embeddings.save()
 
         summary = {
@@ -212,6 +392,27 @@ class TechDocAgent:
 
         return documentation
 
+    def generate_all(self, doc_types: List[str]) -> Dict[str, str]:
+        """
+        Generate several documentation types in one pass.
+
+        The context searches for all types are batched: one embedding request
+        for every query and one stacked FAISS search, instead of a separate
+        API round-trip and index traversal per doc type.
+
+        Args:
+            doc_types: Documentation types to generate
+
+        Returns:
+            Mapping of doc type to generated content
+        """
+        if self.embeddings and len(self.embeddings) > 0:
+            queries = [f"main functionality for {doc_type} documentation" for doc_type in doc_types]
+            batch_results = self.embeddings.search_batch(queries, top_k=10)
+            self._prefetched_chunks.update(zip(doc_types, batch_results))
+
+        return {doc_type: self.generate_documentation(doc_type) for doc_type in doc_types}
+
     def update_documentation(self, doc_type: str = 'README', output_path: Optional[str] = None) -> str:
         """
         Update existing documentation based on recent changes.
@@ -229,7 +430,7 @@ class TechDocAgent:
             print("Change detection not available. Generating new documentation.")
             return self.generate_documentation(doc_type, output_path)
 
-        code_files = ingest_codebase(self.config.project_root) if ingest_codebase else []
+        code_files = self._ingest_cached(self.config.project_root)
         changes = self.change_detector.get_all_changes(code_files)
 
         if not changes:
@@ -355,8 +556,10 @@ class TechDocAgent:
         context['project_name'] = Path(self.config.project_root).name
 
         if self.embeddings and len(self.embeddings) > 0:
-            query = f"main functionality for {doc_type} documentation"
-            relevant_chunks = self.embeddings.search(query, top_k=10)
+            relevant_chunks = self._prefetched_chunks.pop(doc_type, None)
+            if relevant_chunks is None:
+                query = f"main functionality for {doc_type} documentation"
+                relevant_chunks = self.embeddings.search(query, top_k=10)
 
             context['key_components'] = self._format_chunks(relevant_chunks[:5])
             context['sample_code'] = self._format_code_samples(relevant_chunks[:3])
@@ -375,8 +578,47 @@ class TechDocAgent:
 
         return context
 
+    # Prompts within this cosine similarity of a cached prompt reuse its response
+    _LLM_CACHE_THRESHOLD = 0.95
+    _LLM_CACHE_TTL_SECONDS = 3600
+    _LLM_CACHE_MAX_ENTRIES = 1000
+
+    def _prompt_embedding(self, prompt: str) -> Optional[Any]:
+        """L2-normalized embedding of a prompt for the semantic cache."""
+        if not self.embeddings:
+            return None
+
+        embedding = self.embeddings.generate_query_embedding(prompt[:8000])
+        if embedding is None:
+            return None
+
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else None
+
+    def _lookup_llm_cache(self, embedding) -> Optional[str]:
+        """Return a cached response semantically equivalent to the prompt, if any."""
+        entries = self.memory.get_llm_cache(self._LLM_CACHE_TTL_SECONDS)
+        if not entries:
+            return None
+
+        # Entries are stored normalized, so the dot product is the cosine
+        vectors = np.stack([np.frombuffer(e['prompt_embedding'], dtype=np.float32)
+                            for e in entries])
+        similarities = vectors @ embedding
+        best = int(similarities.argmax())
+        if similarities[best] >= self._LLM_CACHE_THRESHOLD:
+            return entries[best]['response']
+        return None
+
     def _call_llm(self, prompt: str) -> str:
-        """Call LLM to generate documentation."""
+        """Call LLM to generate documentation, with a semantic response cache."""
+        embedding = self._prompt_embedding(prompt)
+        if embedding is not None:
+            cached = self._lookup_llm_cache(embedding)
+            if cached is not None:
+                print("  Using cached LLM response (semantic match)")
+                return cached
+
         try:
             model = genai.GenerativeModel(self.config.generation_model)
 
@@ -389,27 +631,33 @@ class TechDocAgent:
                     'top_k': self.config.top_k,
                 }
             )
-
-            return response.text
+            # .text raises on safety-blocked or empty responses, so it
+            # must be read inside the error path
+            text = response.text
 
         except Exception as e:
             print(f"Error calling LLM: {e}")
             return f"Error generating documentation: {e}"
 
+        if embedding is not None:
+            self.memory.put_llm_cache(embedding.astype(np.float32).tobytes(),
+                                      text, self._LLM_CACHE_MAX_ENTRIES)
+
+        return text
+
     def _post_process_documentation(self, content: str, doc_type: str) -> str:
         """Post-process generated documentation."""
 
-        import re
-
-        patterns = [
-            r'sk-[a-zA-Z0-9]{48}', 
-            r'AIza[a-zA-Z0-9_-]{35}',
-            r'[a-zA-Z0-9]{32,}',
-        ]
+        # Cheap prefilter: the secret patterns all need a 32+ char token, so
+        # typical prose output skips the regex scan entirely
+        has_long_token = False
+        for word in content.split():
+            if len(word) >= 32:
+                has_long_token = True
+                break
 
-        for pattern in patterns:
-            if re.search(pattern, content):
-                print(f"Warning: Potential secret detected in documentation")
+        if has_long_token and _SECRET_RE.search(content):
+            print(f"Warning: Potential secret detected in documentation")
 
         return content.strip()
 
@@ -439,21 +687,7 @@ class TechDocAgent:
 
     def _get_update_template(self, doc_type: str) -> str:
         """Get template for updating documentation."""
-        base_template = DocTemplates.get_template(doc_type)
-
-        update_addendum = """
-
-# Update Context
-The codebase has changed. Here are the changes:
-{changes}
-
-Previous documentation:
-{existing_doc}
-
-Please update the documentation to reflect these changes while preserving the overall structure and style.
-"""
-
-        return base_template + update_addendum
+        return _update_template(doc_type)
 
     def _format_chunks(self, chunks: List[Tuple[Dict, float]]) -> str:
         """Format code chunks for context."""
@@ -485,23 +719,48 @@ Please update the documentation to reflect these changes while preserving the ov
 
     def _get_primary_language(self) -> str:
         """Get primary programming language."""
-        if self.embeddings and hasattr(self.embeddings, 'chunks'):
-            langs = {}
-            for chunk in self.embeddings.chunks:
-                lang = chunk.get('language', 'Unknown')
-                langs[lang] = langs.get(lang, 0) + 1
-
-            if langs:
-                return max(langs, key=langs.get)
+        if self.embeddings and getattr(self.embeddings, 'lang_ids', None):
+            # Languages are stored as int ids, so the tally is one C-level bincount
+            counts = np.bincount(np.asarray(self.embeddings.lang_ids, dtype=np.int32))
+            return self.embeddings.id_to_lang[int(counts.argmax())]
 
         return "Unknown"
 
+    def _ingest_cached(self, root_path: Optional[str] = None) -> List[str]:
+        """
+        Ingest the codebase, reusing the last file list while the repository
+        head is unchanged; avoids repeating the filesystem walk when
+        analyze_codebase and update_documentation run in one session.
+        """
+        root_path = root_path or self.config.project_root
+        head = self.change_detector.get_last_commit_hash() if self.change_detector else None
+
+        if (self._file_list_cache is not None and head is not None
+                and self._file_list_cache[0] == head):
+            return self._file_list_cache[1]
+
+        if ingest_codebase:
+            code_files = ingest_codebase(root_path)
+        else:
+            code_files = self._fallback_ingest(root_path)
+
+        self._file_list_cache = (head, code_files)
+        return code_files
+
+    _FALLBACK_SKIP_DIRS = frozenset({'.git', 'node_modules', '__pycache__'})
+
     def _fallback_ingest(self, root_path: str) -> List[str]:
-        """Fallback file ingestion."""
+        """Fallback file ingestion: one os.walk pass instead of one rglob per extension."""
+        exts = frozenset(self.config.code_extensions)
         code_files = []
-        for ext in self.config.code_extensions:
-            code_files.extend(Path(root_path).rglob(f'*{ext}'))
-        return [str(f) for f in code_files]
+        for dirpath, dirnames, filenames in os.walk(root_path):
+            # Prune noise directories in place so walk never descends into them
+            dirnames[:] = [d for d in dirnames if d not in self._FALLBACK_SKIP_DIRS]
+            for name in filenames:
+                i = name.rfind('.')
+                if i >= 0 and name[i:] in exts:
+                    code_files.append(os.path.join(dirpath, name))
+        return code_files
 
     def _fallback_detect_language(self, file_path: str) -> str:
         """Fallback language detection."""
@@ -521,8 +780,9 @@ Please update the documentation to reflect these changes while preserving the ov
 
     def close(self):
         """Clean up resources."""
-        self.memory.close_session(self.session_id)
-        self.memory.close()
+        if 'memory' in self.__dict__:
+            self.memory.close_session(self.session_id)
+            self.memory.close()
         print(f"Session {self.session_id[:8]} closed")
 
     def __enter__(self):
@@ -1,6 +1,16 @@
+import ast
+import bisect
+import functools
+import hashlib
 import os
+import re
+import sys
+import numpy as np
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Set, Tuple
+from typing import Dict, Iterator, List, Optional, Any, Set, Tuple
 
 # Tree-sitter is optional - fallback to regex if not available
 try:
@@ -10,6 +20,247 @@ except ImportError:
     TREE_SITTER_AVAILABLE = False
     print("Warning: tree-sitter not installed. Using fallback analysis.")
 
+# Fallback-analysis patterns, compiled once at import: the analyzer runs once
+# per file across a repo, so per-call re.compile (and the re-module cache
+# lookup for string patterns) is pure overhead. Each language fuses its
+# symbol kinds into one alternation so a file is scanned once, not once
+# per kind; dispatch is on which named group matched.
+
+_PY_COMBINED_RE = re.compile(
+    r'(?P<cls>^(?P<cls_indent>[ \t]*)class\s+(?P<cls_name>\w+)(?:\((?P<cls_parents>[^)]+)\))?:)'
+    r'|(?P<func>^(?P<func_indent>[ \t]*)def\s+(?P<func_name>\w+)\s*\((?P<func_params>[^)]*)\))'
+    r'|(?P<imp_from>^[ \t]*from\s+(?P<imp_from_module>\S+)\s+import\s+(?P<imp_from_names>.+)$)'
+    r'|(?P<imp>^[ \t]*import\s+(?P<imp_modules>.+)$)'
+    r'|(?P<var>^(?P<var_name>[A-Z_][A-Z0-9_]*)\s*=)',
+    re.MULTILINE)
+
+# JavaScript patterns are matched per line rather than fused into one
+# MULTILINE scan: the import and arrow forms need nested optional groups
+# whose combined alternation can backtrack catastrophically on adversarial
+# input. Each pattern below is anchored by .match on a single line and must
+# not span lines.
+_JS_ES_IMPORT_RE = re.compile(r'\s*import\s+(?:\{[^}\n]+\}|\w+)\s+from\s+[\'"][^\'"\n]+[\'"]')
+_JS_REQUIRE_RE = re.compile(r'\s*(?:const|let|var)\s+(?:\{[^}\n]+\}|\w+)\s+=\s+require\([\'"][^\'"\n]+[\'"]\)')
+_JS_CLASS_RE = re.compile(r'\s*class\s+(?P<name>\w+)(?:\s+extends\s+(?P<parent>\w+))?')
+_JS_FUNC_RE = re.compile(r'\s*function\s+(?P<name>\w+)')
+_JS_ARROW_RE = re.compile(r'\s*const\s+(?P<name>\w+)\s*=\s*(?:async\s+)?(?:\([^)\n]*\)|\w+)\s*=>')
+
+_JAVA_COMBINED_RE = re.compile(
+    r'(?P<imp>^\s*import\s+(?P<imp_module>[\w.]+);)'
+    r'|(?P<cls>^\s*(?:public\s+)?(?:class|interface)\s+(?P<cls_name>\w+)(?:\s+extends\s+(?P<cls_parent>\w+))?(?:\s+implements\s+(?P<cls_impl>[\w,\s]+))?)'
+    r'|(?P<func>^\s*(?:public|private|protected)?\s*(?:static)?\s*(?:\w+)\s+(?P<func_name>\w+)\s*\([^)]*\))',
+    re.MULTILINE)
+
+_CPP_COMBINED_RE = re.compile(
+    r'(?P<imp>^\s*#include\s+[<"](?P<imp_file>[^>"]+)[>"])'
+    r'|(?P<cls>^\s*class\s+(?P<cls_name>\w+)(?:\s*:\s*(?:public|private|protected)\s+(?P<cls_parent>\w+))?)',
+    re.MULTILINE)
+
+_GO_COMBINED_RE = re.compile(
+    r'(?P<imp>^\s*import\s+(?:"[^"]+"|\([^)]+\)))'
+    r'|(?P<cls>^\s*type\s+(?P<cls_name>\w+)\s+struct)'
+    r'|(?P<func>^\s*func\s+(?:\(.*?\)\s+)?(?P<func_name>\w+)\s*\()',
+    re.MULTILINE)
+
+_RUST_COMBINED_RE = re.compile(
+    r'(?P<imp>^\s*use\s+(?P<imp_module>[\w:]+))'
+    r'|(?P<cls>^\s*(?:pub\s+)?(?:struct|enum)\s+(?P<cls_name>\w+))'
+    r'|(?P<func>^\s*(?:pub\s+)?fn\s+(?P<func_name>\w+)\s*\()',
+    re.MULTILINE)
+
+# Tree-sitter symbol queries, compiled lazily per analyzer instance
+_TS_QUERIES = {
+    'python': """
+        (class_definition name: (identifier) @class.name)
+        (function_definition name: (identifier) @function.name)
+        (import_statement) @import
+        (import_from_statement) @import_from
+    """,
+}
+
+
+_PY_CONST_NAME_RE = re.compile(r'[A-Z_][A-Z0-9_]*\Z')
+
+# Characters that can change state in the brace-block scan
+_BRACE_SCAN_RE = re.compile(r'[{}"\'`/]')
+
+# Tag strings shared by every symbol dict. Interned so a large scan
+# references one str object per tag across millions of result dicts
+# instead of duplicating them.
+_TYPE_CLASS = sys.intern('class')
+_TYPE_FUNCTION = sys.intern('function')
+_TYPE_METHOD = sys.intern('method')
+_TYPE_STRUCT = sys.intern('struct')
+_TYPE_IMPORT = sys.intern('import')
+_TYPE_FROM_IMPORT = sys.intern('from_import')
+_TYPE_INHERITANCE = sys.intern('inheritance')
+_TYPE_CONSTANT = sys.intern('constant')
+
+# Entries kept in the per-instance analysis cache
+_ANALYSIS_CACHE_MAX = 4096
+
+# Parse trees kept per analyzer for incremental re-analysis
+_TREE_CACHE_MAX = 256
+
+# Chunk lists kept per analyzer, keyed on file stat
+_CHUNK_CACHE_MAX = 1024
+
+# Content size from which the vectorized newline scan beats the find loop
+_VECTOR_SCAN_MIN = 65536
+
+
+class _PythonAstVisitor(ast.NodeVisitor):
+    """Collects the analyzer's result shape from a parsed Python module."""
+
+    def __init__(self):
+        self.result = {
+            'classes': [],
+            'functions': [],
+            'imports': [],
+            'variables': [],
+            'relationships': []
+        }
+        self._class_stack = []
+
+    def visit_ClassDef(self, node):
+        class_info = {
+            'name': node.name,
+            'type': _TYPE_CLASS,
+            'line': node.lineno,
+            'end_line': node.end_lineno,
+            'indent': node.col_offset,
+            'methods': [],
+            'attributes': []
+        }
+
+        parents = [ast.unparse(base) for base in node.bases]
+        if parents:
+            class_info['parents'] = parents
+            for parent in parents:
+                self.result['relationships'].append({
+                    'type': _TYPE_INHERITANCE,
+                    'from': node.name,
+                    'to': parent,
+                    'line': node.lineno
+                })
+
+        self.result['classes'].append(class_info)
+        self._class_stack.append(class_info)
+        self.generic_visit(node)
+        self._class_stack.pop()
+
+    def visit_FunctionDef(self, node):
+        self._add_function(node)
+
+    def visit_AsyncFunctionDef(self, node):
+        self._add_function(node)
+
+    def _add_function(self, node):
+        func_info = {
+            'name': node.name,
+            'type': _TYPE_FUNCTION,
+            'line': node.lineno,
+            'end_line': node.end_lineno,
+            'indent': node.col_offset,
+            'parameters': [arg.arg for arg in node.args.posonlyargs + node.args.args]
+        }
+
+        if self._class_stack:
+            self._class_stack[-1]['methods'].append(func_info)
+            func_info['parent_class'] = self._class_stack[-1]['name']
+        else:
+            self.result['functions'].append(func_info)
+
+        self.generic_visit(node)
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.result['imports'].append({
+                'type': _TYPE_IMPORT,
+                'module': alias.name,
+                'line': node.lineno
+            })
+
+    def visit_ImportFrom(self, node):
+        module = node.module or ''
+        for alias in node.names:
+            self.result['imports'].append({
+                'type': _TYPE_FROM_IMPORT,
+                'module': module,
+                'name': alias.name,
+                'line': node.lineno
+            })
+
+    def visit_Assign(self, node):
+        if node.col_offset == 0:
+            for target in node.targets:
+                if isinstance(target, ast.Name) and _PY_CONST_NAME_RE.match(target.id):
+                    self.result['variables'].append({
+                        'name': target.id,
+                        'type': _TYPE_CONSTANT,
+                        'line': node.lineno
+                    })
+        self.generic_visit(node)
+
+
+def _newline_offsets(content: str) -> array:
+    """
+    Collect the offset of every newline in one linear scan.
+
+    Large files take a vectorized path: the whole buffer is compared
+    against the newline byte in a single numpy pass. Byte offsets only
+    equal character offsets for pure-ASCII content, so anything with
+    multi-byte characters keeps the str.find loop.
+    """
+    if len(content) >= _VECTOR_SCAN_MIN:
+        encoded = content.encode('utf-8', 'ignore')
+        if len(encoded) == len(content):
+            buf = np.frombuffer(encoded, dtype=np.uint8)
+            positions = np.flatnonzero(buf == 0x0A).astype(np.int32)
+            offsets = array('i')
+            offsets.frombytes(positions.tobytes())
+            return offsets
+
+    offsets = array('i')
+    pos = content.find('\n')
+    while pos != -1:
+        offsets.append(pos)
+        pos = content.find('\n', pos + 1)
+    return offsets
+
+
+def _line_number(nl_offsets: array, index: int) -> int:
+    """1-based line number of a character offset, via binary search."""
+    return bisect.bisect_left(nl_offsets, index) + 1
+
+
+def _single_edit_span(old: bytes, new: bytes) -> Tuple[int, int, int]:
+    """
+    Describe the difference between two byte strings as one edit.
+
+    Returns (start, old_end, new_end): the common prefix length and the
+    end of the changed span in each string. Tree-sitter only needs a
+    covering edit, so collapsing all changes into one span is safe.
+    """
+    limit = min(len(old), len(new))
+    start = 0
+    while start < limit and old[start] == new[start]:
+        start += 1
+
+    old_end, new_end = len(old), len(new)
+    while old_end > start and new_end > start and old[old_end - 1] == new[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+
+    return start, old_end, new_end
+
+
+def _byte_point(data: bytes, offset: int) -> Tuple[int, int]:
+    """(row, column) point of a byte offset, as tree-sitter expects."""
+    row = data.count(b'\n', 0, offset)
+    col = offset - (data.rfind(b'\n', 0, offset) + 1)
+    return row, col
+
 
 class ASTAnalyzer:
     """
@@ -22,6 +273,15 @@ class ASTAnalyzer:
     - Enhanced code chunking
     """
 
+    # Tree-sitter parsers are immutable once built, so they are cached at
+    # class level: every analyzer in the process shares one parser per
+    # language, and languages that are never analyzed are never loaded.
+    # Failed loads cache None so each warning prints once.
+    _PARSER_CACHE: Dict[str, Any] = {}
+    _LANGUAGE_CACHE: Dict[str, Any] = {}
+
+    _TS_LANGUAGE_NAMES = ('python', 'javascript', 'typescript', 'java', 'cpp', 'go', 'rust')
+
     def __init__(self, languages_path: Optional[str] = None):
         """
         Initialize AST analyzer.
@@ -30,24 +290,43 @@ class ASTAnalyzer:
             languages_path: Path to tree-sitter language binaries (optional)
         """
         self.languages_path = languages_path
-        self.parsers = {}
+        self._queries = {}
+        self._analysis_cache = OrderedDict()
+        self._tree_cache = OrderedDict()
+        self._chunk_cache = OrderedDict()
 
-        if TREE_SITTER_AVAILABLE and languages_path:
-            self._load_languages()
-
-    def _load_languages(self):
-        """Load tree-sitter language parsers."""
-        supported_languages = ['python', 'javascript', 'typescript', 'java', 'cpp', 'go', 'rust']
+    def _get_parser(self, language: str):
+        """
+        Return the shared tree-sitter parser for a language, or None.
 
-        for lang in supported_languages:
-            try:
-                # language = Language(self.languages_path, lang)
-                # parser = Parser()
-                # parser.set_language(language)
-                # self.parsers[lang] = parser
-                pass
-            except Exception as e:
-                print(f"Could not load {lang} parser: {e}")
+        Parsers are built lazily on first use and shared process-wide via
+        the class-level cache, replacing the eager per-instance load of
+        all supported languages.
+        """
+        if not TREE_SITTER_AVAILABLE or language not in self._TS_LANGUAGE_NAMES:
+            return None
+
+        cache = ASTAnalyzer._PARSER_CACHE
+        if language in cache:
+            return cache[language]
+
+        try:
+            from tree_sitter_languages import get_language, get_parser
+        except ImportError:
+            print("Warning: tree-sitter-languages not installed. Using fallback analysis.")
+            for lang in self._TS_LANGUAGE_NAMES:
+                cache[lang] = None
+            return None
+
+        try:
+            parser = get_parser(language)
+            ASTAnalyzer._LANGUAGE_CACHE[language] = get_language(language)
+        except Exception as e:
+            print(f"Could not load {language} parser: {e}")
+            parser = None
+
+        cache[language] = parser
+        return parser
 
     def analyze_file(self, file_path: str, content: str, language: str) -> Dict[str, Any]:
         """
@@ -61,14 +340,104 @@ class ASTAnalyzer:
         Returns:
             Analysis results with structure, symbols, and relationships
         """
+        # Keyed on content, not path, so re-indexing unchanged files and
+        # analyze_file/extract_chunks calls on the same content parse once
+        cache_key = (hashlib.blake2b(content.encode('utf-8', 'ignore'), digest_size=16).digest(), language)
+        cached = self._analysis_cache.get(cache_key)
+        if cached is not None:
+            self._analysis_cache.move_to_end(cache_key)
+            if cached.get('file_path') != file_path:
+                return {**cached, 'file_path': file_path}
+            return cached
+
         lang_lower = language.lower()
 
-        if TREE_SITTER_AVAILABLE and lang_lower in self.parsers:
-            return self._analyze_with_treesitter(file_path, content, lang_lower)
+        if self._get_parser(lang_lower) is not None:
+            result = self._analyze_with_treesitter(file_path, content, lang_lower)
         else:
-            return self._analyze_with_fallback(file_path, content, language)
+            result = self._analyze_with_fallback(file_path, content, language)
+
+        self._analysis_cache[cache_key] = result
+        if len(self._analysis_cache) > _ANALYSIS_CACHE_MAX:
+            self._analysis_cache.popitem(last=False)
+
+        return result
+
+    def analyze_files(self, file_specs: List[Tuple[str, str, str]]) -> List[Dict[str, Any]]:
+        """
+        Analyze many files in parallel across worker processes.
+
+        The per-file analysis is pure CPU work with no shared state, so it
+        scales across processes; each worker builds its own analyzer once.
+
+        Args:
+            file_specs: List of (file_path, content, language) tuples
+
+        Returns:
+            Analysis results in the same order as file_specs
+        """
+        if len(file_specs) <= 1:
+            return [self.analyze_file(*spec) for spec in file_specs]
+
+        worker = functools.partial(_analyze_file_worker, languages_path=self.languages_path)
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            return list(executor.map(worker, file_specs, chunksize=16))
 
-    def _analyze_with_treesitter(self, file_path: str, content: str, language: str) -> Dict[str, Any]:
+    def analyze_file_incremental(self, file_path: str, content: str, language: str) -> Dict[str, Any]:
+        """
+        Re-analyze a file that changed, reusing its previous parse tree.
+
+        Tree-sitter can reparse an edited file in time proportional to the
+        edit rather than the file size: the tree from the previous call for
+        this path is edited with the changed byte span (derived by diffing
+        the old and new content) and handed back to the parser, which
+        reuses every unchanged subtree. Falls back to a full analyze_file
+        when tree-sitter is unavailable or no previous tree exists.
+
+        Args:
+            file_path: Path to the file
+            content: New file content
+            language: Programming language
+
+        Returns:
+            Analysis results with structure, symbols, and relationships
+        """
+        lang_lower = language.lower()
+        parser = self._get_parser(lang_lower)
+        if parser is None:
+            return self.analyze_file(file_path, content, language)
+
+        new_bytes = content.encode('utf-8', 'ignore')
+        old_tree = None
+        entry = self._tree_cache.get(file_path)
+        if entry is not None:
+            old_bytes, old_tree = entry
+            if old_bytes != new_bytes:
+                start, old_end, new_end = _single_edit_span(old_bytes, new_bytes)
+                old_tree.edit(
+                    start_byte=start,
+                    old_end_byte=old_end,
+                    new_end_byte=new_end,
+                    start_point=_byte_point(old_bytes, start),
+                    old_end_point=_byte_point(old_bytes, old_end),
+                    new_end_point=_byte_point(new_bytes, new_end)
+                )
+
+        try:
+            tree = parser.parse(new_bytes, old_tree)
+        except Exception as e:
+            print(f"Tree-sitter incremental parse failed for {file_path}: {e}")
+            self._tree_cache.pop(file_path, None)
+            return self.analyze_file(file_path, content, language)
+
+        self._tree_cache[file_path] = (new_bytes, tree)
+        self._tree_cache.move_to_end(file_path)
+        if len(self._tree_cache) > _TREE_CACHE_MAX:
+            self._tree_cache.popitem(last=False)
+
+        return self._analyze_with_treesitter(file_path, content, lang_lower, tree=tree)
+
+    def _analyze_with_treesitter(self, file_path: str, content: str, language: str, tree: Optional[Any] = None) -> Dict[str, Any]:
         """
         Analyze code using tree-sitter.
 
@@ -76,19 +445,17 @@ class ASTAnalyzer:
             file_path: File path
             content: Code content
             language: Language name
+            tree: Pre-parsed tree to reuse instead of parsing content
 
         Returns:
             Analysis results
         """
-        
-        parser = self.parsers.get(language)
+        parser = self._get_parser(language)
+        query_source = _TS_QUERIES.get(language)
 
-        if not parser:
+        if not parser or not query_source:
             return self._analyze_with_fallback(file_path, content, language)
 
-        tree = parser.parse(bytes(content, 'utf-8'))
-        root_node = tree.root_node
-
         result = {
             'file_path': file_path,
             'language': language,
@@ -99,7 +466,76 @@ class ASTAnalyzer:
             'relationships': []
         }
 
-        return result
+        try:
+            if tree is None:
+                tree = parser.parse(bytes(content, 'utf-8'))
+
+            query = self._queries.get(language)
+            if query is None:
+                query = ASTAnalyzer._LANGUAGE_CACHE[language].query(query_source)
+                self._queries[language] = query
+
+            classes_by_node = {}
+
+            for node, capture_name in query.captures(tree.root_node):
+                line_num = node.start_point[0] + 1
+
+                if capture_name == 'class.name':
+                    class_info = {
+                        'name': node.text.decode('utf-8', 'ignore'),
+                        'type': _TYPE_CLASS,
+                        'line': line_num,
+                        'indent': node.start_point[1],
+                        'methods': [],
+                        'attributes': []
+                    }
+                    result['classes'].append(class_info)
+                    classes_by_node[node.parent.start_byte] = class_info
+
+                elif capture_name == 'function.name':
+                    func_info = {
+                        'name': node.text.decode('utf-8', 'ignore'),
+                        'type': _TYPE_FUNCTION,
+                        'line': line_num,
+                        'indent': node.start_point[1]
+                    }
+
+                    enclosing = node.parent.parent
+                    while enclosing is not None and enclosing.type != 'class_definition':
+                        enclosing = enclosing.parent
+
+                    owner = classes_by_node.get(enclosing.start_byte) if enclosing else None
+                    if owner is not None:
+                        owner['methods'].append(func_info)
+                        func_info['parent_class'] = owner['name']
+                    else:
+                        result['functions'].append(func_info)
+
+                elif capture_name == 'import':
+                    text = node.text.decode('utf-8', 'ignore')
+                    for module in text[len('import'):].split(','):
+                        result['imports'].append({
+                            'type': _TYPE_IMPORT,
+                            'module': module.strip().split(' as ')[0],
+                            'line': line_num
+                        })
+
+                elif capture_name == 'import_from':
+                    text = node.text.decode('utf-8', 'ignore')
+                    parts = text.split('import', 1)
+                    module = parts[0].replace('from', '', 1).strip()
+                    for name in parts[1].split(','):
+                        result['imports'].append({
+                            'type': _TYPE_FROM_IMPORT,
+                            'module': module,
+                            'name': name.strip(),
+                            'line': line_num
+                        })
+
+            return result
+        except Exception as e:
+            print(f"Tree-sitter analysis failed for {file_path}: {e}")
+            return self._analyze_with_fallback(file_path, content, language)
 
     def _analyze_with_fallback(self, file_path: str, content: str, language: str) -> Dict[str, Any]:
         """
@@ -113,28 +549,17 @@ class ASTAnalyzer:
         Returns:
             Analysis results
         """
-        result = {
-            'file_path': file_path,
-            'language': language,
-            'classes': [],
-            'functions': [],
-            'imports': [],
-            'variables': [],
-            'relationships': []
-        }
-
-        if language == 'Python':
-            result = self._analyze_python(content)
-        elif language in ('JavaScript', 'TypeScript'):
-            result = self._analyze_javascript(content)
-        elif language == 'Java':
-            result = self._analyze_java(content)
-        elif language in ('C++', 'C'):
-            result = self._analyze_cpp(content)
-        elif language == 'Go':
-            result = self._analyze_go(content)
-        elif language == 'Rust':
-            result = self._analyze_rust(content)
+        analyze = self._FALLBACK_DISPATCH.get(language)
+        if analyze is not None:
+            result = analyze(self, content)
+        else:
+            result = {
+                'classes': [],
+                'functions': [],
+                'imports': [],
+                'variables': [],
+                'relationships': []
+            }
 
         result['file_path'] = file_path
         result['language'] = language
@@ -142,9 +567,32 @@ class ASTAnalyzer:
         return result
 
     def _analyze_python(self, content: str) -> Dict[str, Any]:
-        """Analyze Python code."""
-        import re
+        """Analyze Python code with the stdlib ast parser."""
+        # Probe for candidate keywords before starting the parser: files
+        # that cannot contain any symbol (data, prose, generated text)
+        # short-circuit on a few C-level substring checks
+        if ('def' not in content and 'class' not in content
+                and 'import' not in content and '=' not in content):
+            return {
+                'classes': [],
+                'functions': [],
+                'imports': [],
+                'variables': [],
+                'relationships': []
+            }
+
+        try:
+            tree = ast.parse(content)
+        except (SyntaxError, ValueError):
+            # Malformed or partial source: fall back to the regex scan
+            return self._analyze_python_regex(content)
 
+        visitor = _PythonAstVisitor()
+        visitor.visit(tree)
+        return visitor.result
+
+    def _analyze_python_regex(self, content: str) -> Dict[str, Any]:
+        """Regex analysis of Python code that does not parse."""
         result = {
             'classes': [],
             'functions': [],
@@ -153,97 +601,100 @@ class ASTAnalyzer:
             'relationships': []
         }
 
-        lines = content.split('\n')
+        nl_offsets = _newline_offsets(content)
 
-        # Extract imports
-        for i, line in enumerate(lines, 1):
-            match = re.match(r'^\s*from\s+(\S+)\s+import\s+(.+)$', line)
-            if match:
-                module, names = match.groups()
-                for name in names.split(','):
+        # Single fused pass over the file. Classes and defs arrive in
+        # position order, so an indent stack attaches each def to its
+        # innermost enclosing class in O(1) — nested classes included,
+        # with no interval search over the class list
+        class_stack = []
+        for match in _PY_COMBINED_RE.finditer(content):
+            line_num = _line_number(nl_offsets, match.start())
+
+            if match.group('cls') is not None:
+                indent = len(match.group('cls_indent'))
+                name = match.group('cls_name')
+                parents = match.group('cls_parents')
+
+                while class_stack and indent <= class_stack[-1]['indent']:
+                    class_stack.pop()
+
+                class_info = {
+                    'name': name,
+                    'type': _TYPE_CLASS,
+                    'line': line_num,
+                    'indent': indent,
+                    'methods': [],
+                    'attributes': []
+                }
+
+                if parents:
+                    class_info['parents'] = [p.strip() for p in parents.split(',')]
+                    for parent in class_info['parents']:
+                        result['relationships'].append({
+                            'type': _TYPE_INHERITANCE,
+                            'from': name,
+                            'to': parent,
+                            'line': line_num
+                        })
+
+                result['classes'].append(class_info)
+                class_stack.append(class_info)
+            elif match.group('func') is not None:
+                indent = len(match.group('func_indent'))
+                params = match.group('func_params')
+
+                while class_stack and indent <= class_stack[-1]['indent']:
+                    class_stack.pop()
+
+                # partition stops at the first ':'/'=' without building
+                # the tail lists that split would allocate per parameter
+                parameters = []
+                for p in params.split(','):
+                    p = p.strip()
+                    if p:
+                        parameters.append(p.partition(':')[0].partition('=')[0].strip())
+
+                func_info = {
+                    'name': match.group('func_name'),
+                    'type': _TYPE_FUNCTION,
+                    'line': line_num,
+                    'indent': indent,
+                    'parameters': parameters
+                }
+
+                if class_stack:
+                    class_stack[-1]['methods'].append(func_info)
+                    func_info['parent_class'] = class_stack[-1]['name']
+                else:
+                    result['functions'].append(func_info)
+            elif match.group('imp_from') is not None:
+                module = match.group('imp_from_module')
+                for name in match.group('imp_from_names').split(','):
                     result['imports'].append({
-                        'type': 'from_import',
+                        'type': _TYPE_FROM_IMPORT,
                         'module': module,
                         'name': name.strip(),
-                        'line': i
+                        'line': line_num
                     })
-                continue
-
-            match = re.match(r'^\s*import\s+(.+)$', line)
-            if match:
-                modules = match.group(1)
-                for module in modules.split(','):
+            elif match.group('imp') is not None:
+                for module in match.group('imp_modules').split(','):
                     result['imports'].append({
-                        'type': 'import',
+                        'type': _TYPE_IMPORT,
                         'module': module.strip().split(' as ')[0],
-                        'line': i
-                    })
-
-        class_pattern = re.compile(r'^(\s*)class\s+(\w+)(\(([^)]+)\))?:', re.MULTILINE)
-        for match in class_pattern.finditer(content):
-            indent, name, _, parents = match.groups()
-            line_num = content[:match.start()].count('\n') + 1
-
-            class_info = {
-                'name': name,
-                'type': 'class',
-                'line': line_num,
-                'indent': len(indent),
-                'methods': [],
-                'attributes': []
-            }
-
-            if parents:
-                class_info['parents'] = [p.strip() for p in parents.split(',')]
-                for parent in class_info['parents']:
-                    result['relationships'].append({
-                        'type': 'inheritance',
-                        'from': name,
-                        'to': parent,
                         'line': line_num
                     })
-
-            result['classes'].append(class_info)
-
-        func_pattern = re.compile(r'^(\s*)def\s+(\w+)\s*\(([^)]*)\)', re.MULTILINE)
-        for match in func_pattern.finditer(content):
-            indent, name, params = match.groups()
-            line_num = content[:match.start()].count('\n') + 1
-
-            func_info = {
-                'name': name,
-                'type': 'function',
-                'line': line_num,
-                'indent': len(indent),
-                'parameters': [p.strip().split(':')[0].split('=')[0].strip()
-                             for p in params.split(',') if p.strip()]
-            }
-
-            if indent.strip() or len(indent) > 0:
-                for cls in result['classes']:
-                    if cls['line'] < line_num and len(indent) > cls['indent']:
-                        cls['methods'].append(func_info)
-                        func_info['parent_class'] = cls['name']
-                        break
             else:
-                result['functions'].append(func_info)
-
-        var_pattern = re.compile(r'^([A-Z_][A-Z0-9_]*)\s*=', re.MULTILINE)
-        for match in var_pattern.finditer(content):
-            name = match.group(1)
-            line_num = content[:match.start()].count('\n') + 1
-            result['variables'].append({
-                'name': name,
-                'type': 'constant',
-                'line': line_num
-            })
+                result['variables'].append({
+                    'name': match.group('var_name'),
+                    'type': _TYPE_CONSTANT,
+                    'line': line_num
+                })
 
         return result
 
     def _analyze_javascript(self, content: str) -> Dict[str, Any]:
         """Analyze JavaScript/TypeScript code."""
-        import re
-
         result = {
             'classes': [],
             'functions': [],
@@ -252,45 +703,49 @@ class ASTAnalyzer:
             'relationships': []
         }
 
-        import_pattern = re.compile(r'^\s*(?:import|const|let|var)\s+(?:{([^}]+)}|\w+)\s+(?:=\s+require\([\'"]([^\'"]+)[\'"]\)|from\s+[\'"]([^\'"]+)[\'"])', re.MULTILINE)
-        for match in import_pattern.finditer(content):
-            line_num = content[:match.start()].count('\n') + 1
-            result['imports'].append({
-                'type': 'import',
-                'line': line_num
-            })
-
-        class_pattern = re.compile(r'^\s*class\s+(\w+)(?:\s+extends\s+(\w+))?', re.MULTILINE)
-        for match in class_pattern.finditer(content):
-            name, parent = match.groups()
-            line_num = content[:match.start()].count('\n') + 1
+        # No candidate keyword anywhere: nothing below can match
+        if ('import' not in content and 'require' not in content
+                and 'class' not in content and 'function' not in content
+                and '=>' not in content):
+            return result
 
-            class_info = {
-                'name': name,
-                'type': 'class',
-                'line': line_num,
-                'methods': []
-            }
-
-            if parent:
-                class_info['parent'] = parent
-                result['relationships'].append({
-                    'type': 'inheritance',
-                    'from': name,
-                    'to': parent,
+        for line_num, line in enumerate(content.split('\n'), 1):
+            if _JS_ES_IMPORT_RE.match(line) or _JS_REQUIRE_RE.match(line):
+                result['imports'].append({
+                    'type': _TYPE_IMPORT,
                     'line': line_num
                 })
+                continue
 
-            result['classes'].append(class_info)
+            match = _JS_CLASS_RE.match(line)
+            if match:
+                name = match.group('name')
+                parent = match.group('parent')
 
-        func_pattern = re.compile(r'^\s*(?:function\s+(\w+)|const\s+(\w+)\s*=\s*(?:async\s+)?(?:\([^)]*\)|[^=])+\s*=>)', re.MULTILINE)
-        for match in func_pattern.finditer(content):
-            name = match.group(1) or match.group(2)
-            if name:
-                line_num = content[:match.start()].count('\n') + 1
-                result['functions'].append({
+                class_info = {
                     'name': name,
-                    'type': 'function',
+                    'type': _TYPE_CLASS,
+                    'line': line_num,
+                    'methods': []
+                }
+
+                if parent:
+                    class_info['parent'] = parent
+                    result['relationships'].append({
+                        'type': _TYPE_INHERITANCE,
+                        'from': name,
+                        'to': parent,
+                        'line': line_num
+                    })
+
+                result['classes'].append(class_info)
+                continue
+
+            match = _JS_FUNC_RE.match(line) or _JS_ARROW_RE.match(line)
+            if match:
+                result['functions'].append({
+                    'name': match.group('name'),
+                    'type': _TYPE_FUNCTION,
                     'line': line_num
                 })
 
@@ -298,8 +753,6 @@ class ASTAnalyzer:
 
     def _analyze_java(self, content: str) -> Dict[str, Any]:
         """Analyze Java code."""
-        import re
-
         result = {
             'classes': [],
             'functions': [],
@@ -308,64 +761,63 @@ class ASTAnalyzer:
             'relationships': []
         }
 
-        import_pattern = re.compile(r'^\s*import\s+([\w.]+);', re.MULTILINE)
-        for match in import_pattern.finditer(content):
-            line_num = content[:match.start()].count('\n') + 1
-            result['imports'].append({
-                'type': 'import',
-                'module': match.group(1),
-                'line': line_num
-            })
+        # No candidate keyword anywhere: nothing below can match
+        if ('import' not in content and 'class' not in content
+                and 'interface' not in content and '(' not in content):
+            return result
 
-        class_pattern = re.compile(r'^\s*(?:public\s+)?(?:class|interface)\s+(\w+)(?:\s+extends\s+(\w+))?(?:\s+implements\s+([\w,\s]+))?', re.MULTILINE)
-        for match in class_pattern.finditer(content):
-            name = match.group(1)
-            parent = match.group(2)
-            interfaces = match.group(3)
-            line_num = content[:match.start()].count('\n') + 1
-
-            class_info = {
-                'name': name,
-                'type': 'class',
-                'line': line_num,
-                'methods': []
-            }
+        nl_offsets = _newline_offsets(content)
 
-            if parent:
-                result['relationships'].append({
-                    'type': 'inheritance',
-                    'from': name,
-                    'to': parent,
+        for match in _JAVA_COMBINED_RE.finditer(content):
+            line_num = _line_number(nl_offsets, match.start())
+
+            if match.group('imp') is not None:
+                result['imports'].append({
+                    'type': _TYPE_IMPORT,
+                    'module': match.group('imp_module'),
                     'line': line_num
                 })
+            elif match.group('cls') is not None:
+                name = match.group('cls_name')
+                parent = match.group('cls_parent')
+                interfaces = match.group('cls_impl')
 
-            if interfaces:
-                for iface in interfaces.split(','):
+                class_info = {
+                    'name': name,
+                    'type': _TYPE_CLASS,
+                    'line': line_num,
+                    'methods': []
+                }
+
+                if parent:
                     result['relationships'].append({
-                        'type': 'implementation',
+                        'type': _TYPE_INHERITANCE,
                         'from': name,
-                        'to': iface.strip(),
+                        'to': parent,
                         'line': line_num
                     })
 
-            result['classes'].append(class_info)
+                if interfaces:
+                    for iface in interfaces.split(','):
+                        result['relationships'].append({
+                            'type': 'implementation',
+                            'from': name,
+                            'to': iface.strip(),
+                            'line': line_num
+                        })
 
-        method_pattern = re.compile(r'^\s*(?:public|private|protected)?\s*(?:static)?\s*(?:\w+)\s+(\w+)\s*\([^)]*\)', re.MULTILINE)
-        for match in method_pattern.finditer(content):
-            name = match.group(1)
-            line_num = content[:match.start()].count('\n') + 1
-            result['functions'].append({
-                'name': name,
-                'type': 'method',
-                'line': line_num
-            })
+                result['classes'].append(class_info)
+            else:
+                result['functions'].append({
+                    'name': match.group('func_name'),
+                    'type': _TYPE_METHOD,
+                    'line': line_num
+                })
 
         return result
 
     def _analyze_cpp(self, content: str) -> Dict[str, Any]:
         """Analyze C++ code."""
-        import re
-
         result = {
             'classes': [],
             'functions': [],
@@ -374,43 +826,46 @@ class ASTAnalyzer:
             'relationships': []
         }
 
-        include_pattern = re.compile(r'^\s*#include\s+[<"]([^>"]+)[>"]', re.MULTILINE)
-        for match in include_pattern.finditer(content):
-            line_num = content[:match.start()].count('\n') + 1
-            result['imports'].append({
-                'type': 'include',
-                'file': match.group(1),
-                'line': line_num
-            })
+        # No candidate keyword anywhere: nothing below can match
+        if '#include' not in content and 'class' not in content:
+            return result
 
-        class_pattern = re.compile(r'^\s*class\s+(\w+)(?:\s*:\s*(?:public|private|protected)\s+(\w+))?', re.MULTILINE)
-        for match in class_pattern.finditer(content):
-            name, parent = match.groups()
-            line_num = content[:match.start()].count('\n') + 1
+        nl_offsets = _newline_offsets(content)
 
-            class_info = {
-                'name': name,
-                'type': 'class',
-                'line': line_num,
-                'methods': []
-            }
+        for match in _CPP_COMBINED_RE.finditer(content):
+            line_num = _line_number(nl_offsets, match.start())
 
-            if parent:
-                result['relationships'].append({
-                    'type': 'inheritance',
-                    'from': name,
-                    'to': parent,
+            if match.group('imp') is not None:
+                result['imports'].append({
+                    'type': 'include',
+                    'file': match.group('imp_file'),
                     'line': line_num
                 })
+            else:
+                name = match.group('cls_name')
+                parent = match.group('cls_parent')
 
-            result['classes'].append(class_info)
+                class_info = {
+                    'name': name,
+                    'type': _TYPE_CLASS,
+                    'line': line_num,
+                    'methods': []
+                }
+
+                if parent:
+                    result['relationships'].append({
+                        'type': _TYPE_INHERITANCE,
+                        'from': name,
+                        'to': parent,
+                        'line': line_num
+                    })
+
+                result['classes'].append(class_info)
 
         return result
 
     def _analyze_go(self, content: str) -> Dict[str, Any]:
         """Analyze Go code."""
-        import re
-
         result = {
             'classes': [],
             'functions': [],
@@ -419,40 +874,38 @@ class ASTAnalyzer:
             'relationships': []
         }
 
-        import_pattern = re.compile(r'^\s*import\s+(?:"([^"]+)"|(\([^)]+\)))', re.MULTILINE)
-        for match in import_pattern.finditer(content):
-            line_num = content[:match.start()].count('\n') + 1
-            result['imports'].append({
-                'type': 'import',
-                'line': line_num
-            })
+        # No candidate keyword anywhere: nothing below can match
+        if ('import' not in content and 'type' not in content
+                and 'func' not in content):
+            return result
 
-        struct_pattern = re.compile(r'^\s*type\s+(\w+)\s+struct', re.MULTILINE)
-        for match in struct_pattern.finditer(content):
-            name = match.group(1)
-            line_num = content[:match.start()].count('\n') + 1
-            result['classes'].append({
-                'name': name,
-                'type': 'struct',
-                'line': line_num
-            })
+        nl_offsets = _newline_offsets(content)
 
-        func_pattern = re.compile(r'^\s*func\s+(?:\(.*?\)\s+)?(\w+)\s*\(', re.MULTILINE)
-        for match in func_pattern.finditer(content):
-            name = match.group(1)
-            line_num = content[:match.start()].count('\n') + 1
-            result['functions'].append({
-                'name': name,
-                'type': 'function',
-                'line': line_num
-            })
+        for match in _GO_COMBINED_RE.finditer(content):
+            line_num = _line_number(nl_offsets, match.start())
+
+            if match.group('imp') is not None:
+                result['imports'].append({
+                    'type': _TYPE_IMPORT,
+                    'line': line_num
+                })
+            elif match.group('cls') is not None:
+                result['classes'].append({
+                    'name': match.group('cls_name'),
+                    'type': _TYPE_STRUCT,
+                    'line': line_num
+                })
+            else:
+                result['functions'].append({
+                    'name': match.group('func_name'),
+                    'type': _TYPE_FUNCTION,
+                    'line': line_num
+                })
 
         return result
 
     def _analyze_rust(self, content: str) -> Dict[str, Any]:
         """Analyze Rust code."""
-        import re
-
         result = {
             'classes': [],
             'functions': [],
@@ -461,41 +914,63 @@ class ASTAnalyzer:
             'relationships': []
         }
 
-        use_pattern = re.compile(r'^\s*use\s+([\w:]+)', re.MULTILINE)
-        for match in use_pattern.finditer(content):
-            line_num = content[:match.start()].count('\n') + 1
-            result['imports'].append({
-                'type': 'use',
-                'module': match.group(1),
-                'line': line_num
-            })
+        # No candidate keyword anywhere: nothing below can match
+        if ('use' not in content and 'struct' not in content
+                and 'enum' not in content and 'fn' not in content):
+            return result
 
-        struct_pattern = re.compile(r'^\s*(?:pub\s+)?(?:struct|enum)\s+(\w+)', re.MULTILINE)
-        for match in struct_pattern.finditer(content):
-            name = match.group(1)
-            line_num = content[:match.start()].count('\n') + 1
-            result['classes'].append({
-                'name': name,
-                'type': 'struct',
-                'line': line_num
-            })
+        nl_offsets = _newline_offsets(content)
 
-        func_pattern = re.compile(r'^\s*(?:pub\s+)?fn\s+(\w+)\s*\(', re.MULTILINE)
-        for match in func_pattern.finditer(content):
-            name = match.group(1)
-            line_num = content[:match.start()].count('\n') + 1
-            result['functions'].append({
-                'name': name,
-                'type': 'function',
-                'line': line_num
-            })
+        for match in _RUST_COMBINED_RE.finditer(content):
+            line_num = _line_number(nl_offsets, match.start())
+
+            if match.group('imp') is not None:
+                result['imports'].append({
+                    'type': 'use',
+                    'module': match.group('imp_module'),
+                    'line': line_num
+                })
+            elif match.group('cls') is not None:
+                result['classes'].append({
+                    'name': match.group('cls_name'),
+                    'type': _TYPE_STRUCT,
+                    'line': line_num
+                })
+            else:
+                result['functions'].append({
+                    'name': match.group('func_name'),
+                    'type': _TYPE_FUNCTION,
+                    'line': line_num
+                })
 
         return result
 
+    # Language dispatch tables: one hash lookup instead of a chain of
+    # string comparisons per file. Defined after the methods they
+    # reference so the table holds the plain functions.
+    _FALLBACK_DISPATCH = {
+        'Python': _analyze_python,
+        'JavaScript': _analyze_javascript,
+        'TypeScript': _analyze_javascript,
+        'Java': _analyze_java,
+        'C++': _analyze_cpp,
+        'C': _analyze_cpp,
+        'Go': _analyze_go,
+        'Rust': _analyze_rust,
+    }
+
+    _BRACE_LANGUAGES = frozenset(
+        ('JavaScript', 'TypeScript', 'Java', 'C++', 'C', 'C#', 'Go', 'Rust'))
+
     def extract_chunks(self, file_path: str, content: str, language: str) -> List[Dict[str, Any]]:
         """
         Extract semantic code chunks from a file.
 
+        Results for real files are cached on (path, mtime, size), so
+        watch-mode and repeated doc-generation runs skip re-analysis of
+        unchanged files for the cost of a stat. Synthetic paths bypass
+        the cache.
+
         Args:
             file_path: File path
             content: File content
@@ -504,115 +979,271 @@ class ASTAnalyzer:
         Returns:
             List of code chunks with metadata
         """
+        cache_key = None
+        try:
+            st = os.stat(file_path)
+            cache_key = (file_path, st.st_mtime_ns, st.st_size, language)
+        except OSError:
+            pass
+
+        if cache_key is not None:
+            cached = self._chunk_cache.get(cache_key)
+            if cached is not None:
+                self._chunk_cache.move_to_end(cache_key)
+                return list(cached)
+
+        chunks = list(self.iter_chunks(file_path, content, language))
+
+        if cache_key is not None:
+            self._chunk_cache[cache_key] = chunks
+            if len(self._chunk_cache) > _CHUNK_CACHE_MAX:
+                self._chunk_cache.popitem(last=False)
+            return list(chunks)
+
+        return chunks
+
+    def analyze_and_chunk(self, file_path: str, content: str, language: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Analyze a file and extract its chunks in one call.
+
+        Callers that need both results pay for a single parse: the analysis
+        feeds chunk extraction directly instead of being recomputed.
+
+        Args:
+            file_path: File path
+            content: File content
+            language: Programming language
+
+        Returns:
+            Tuple of (analysis results, list of code chunks)
+        """
+        analysis = self.analyze_file(file_path, content, language)
+        chunks = list(self._iter_chunks_from(analysis, file_path, content, language))
+        return analysis, chunks
+
+    def iter_chunks(self, file_path: str, content: str, language: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yield semantic code chunks from a file one at a time.
+
+        Streaming variant of extract_chunks: only one chunk is alive at a
+        time, so callers that process chunks incrementally never hold the
+        whole chunk list in memory.
+
+        Args:
+            file_path: File path
+            content: File content
+            language: Programming language
+
+        Yields:
+            Code chunks with metadata
+        """
         analysis = self.analyze_file(file_path, content, language)
-        chunks = []
-        lines = content.split('\n')
+        return self._iter_chunks_from(analysis, file_path, content, language)
+
+    def _iter_chunks_from(self, analysis: Dict[str, Any], file_path: str, content: str, language: str) -> Iterator[Dict[str, Any]]:
+        """Yield chunks for an already-computed analysis of the content."""
+        yielded = False
+
+        # Per-file tables built once so the per-chunk loops below do integer
+        # lookups and string slices instead of re-scanning lines. Packed as
+        # typed arrays: a few bytes per line instead of a PyObject per entry.
+        # The newline index stands in for content.split('\n'), which would
+        # allocate one string per line just to walk them.
+        line_starts = array('i', [0])
+        line_starts.extend(offset + 1 for offset in _newline_offsets(content))
+
+        # Indent widths and code/blank flags come from one character walk
+        # per line over the content itself; no per-line strings exist.
+        n = len(line_starts)
+        total = len(content)
+        indents = array('i', [0]) * n
+        is_code = array('b', [0]) * n
+        whitespace = ' \t\x0b\x0c\r'
+        for idx in range(n):
+            i = line_starts[idx]
+            line_end = line_starts[idx + 1] - 1 if idx + 1 < n else total
+            while i < line_end and content[i] in whitespace:
+                i += 1
+            indents[idx] = i - line_starts[idx]
+            if i < line_end:
+                is_code[idx] = 1
+
+        # Next-dedent table: for each line, the first later non-blank line at
+        # the same or lesser indent. Built right to left with block jumps so
+        # the Python block-end search is a table lookup instead of a rescan.
+        next_dedent = array('i', [n]) * n
+        next_code = array('i', [n]) * (n + 1)
+        for i in range(n - 1, -1, -1):
+            next_code[i] = i if is_code[i] else next_code[i + 1]
+        for i in range(n - 1, -1, -1):
+            j = next_code[i + 1]
+            while j < n and indents[j] > indents[i]:
+                j = next_dedent[j]
+            next_dedent[i] = j
 
         for cls in analysis.get('classes', []):
             chunk = self._extract_chunk_lines(
-                lines,
+                content,
+                line_starts,
                 cls['line'] - 1,
-                self._find_block_end(lines, cls['line'] - 1, language)
+                cls.get('end_line') or self._find_block_end(content, line_starts, is_code, next_dedent, cls['line'] - 1, language)
             )
-            chunks.append({
-                'type': 'class',
+            yielded = True
+            yield {
+                'type': _TYPE_CLASS,
                 'name': cls['name'],
                 'start_line': cls['line'],
                 'end_line': chunk['end_line'],
                 'code': chunk['code'],
                 'metadata': cls
-            })
+            }
 
         for func in analysis.get('functions', []):
             chunk = self._extract_chunk_lines(
-                lines,
+                content,
+                line_starts,
                 func['line'] - 1,
-                self._find_block_end(lines, func['line'] - 1, language)
+                func.get('end_line') or self._find_block_end(content, line_starts, is_code, next_dedent, func['line'] - 1, language)
             )
-            chunks.append({
-                'type': 'function',
+            yielded = True
+            yield {
+                'type': _TYPE_FUNCTION,
                 'name': func['name'],
                 'start_line': func['line'],
                 'end_line': chunk['end_line'],
                 'code': chunk['code'],
                 'metadata': func
-            })
+            }
 
-        if not chunks:
-            chunks.append({
+        if not yielded:
+            yield {
                 'type': 'file',
                 'name': Path(file_path).stem,
                 'start_line': 1,
-                'end_line': len(lines),
+                'end_line': n,
                 'code': content,
                 'metadata': analysis
-            })
-
-        return chunks
+            }
 
-    def _extract_chunk_lines(self, lines: List[str], start: int, end: int) -> Dict[str, Any]:
-        """Extract lines for a chunk."""
-        chunk_lines = lines[start:end]
+    def _extract_chunk_lines(self, content: str, line_starts: array, start: int, end: int) -> Dict[str, Any]:
+        """Extract the chunk between two line indices as a content slice."""
+        if end >= len(line_starts):
+            code = content[line_starts[start]:]
+        else:
+            code = content[line_starts[start]:line_starts[end] - 1]
         return {
             'start_line': start + 1,
             'end_line': end,
-            'code': '\n'.join(chunk_lines)
+            'code': code
         }
 
-    def _find_block_end(self, lines: List[str], start: int, language: str) -> int:
+    def _find_block_end(self, content: str, line_starts: array, is_code: array, next_dedent: array, start: int, language: str) -> int:
         """
         Find the end of a code block.
 
         Args:
-            lines: Code lines
+            content: File content
+            line_starts: Per-line start offsets into content
+            is_code: Per-line flags, False for blank lines
+            next_dedent: Per-line next-dedent table from extract_chunks
             start: Start line index
             language: Programming language
 
         Returns:
             End line index
         """
-        if language in ('Python',):
-            return self._find_python_block_end(lines, start)
-        elif language in ('JavaScript', 'TypeScript', 'Java', 'C++', 'C', 'C#', 'Go', 'Rust'):
-            return self._find_brace_block_end(lines, start)
+        if language == 'Python':
+            return self._find_python_block_end(next_dedent, start)
+        elif language in self._BRACE_LANGUAGES:
+            return self._find_brace_block_end(content, line_starts, start)
         else:
-            for i in range(start + 1, len(lines)):
-                if not lines[i].strip():
+            for i in range(start + 1, len(is_code)):
+                if not is_code[i]:
                     return i
-            return len(lines)
+            return len(is_code)
 
-    def _find_python_block_end(self, lines: List[str], start: int) -> int:
-        """Find end of Python block based on indentation."""
-        if start >= len(lines):
-            return len(lines)
+    def _find_python_block_end(self, next_dedent: array, start: int) -> int:
+        """Find end of Python block from the precomputed next-dedent table."""
+        if start >= len(next_dedent):
+            return len(next_dedent)
 
-        base_indent = len(lines[start]) - len(lines[start].lstrip())
+        return next_dedent[start]
 
-        for i in range(start + 1, len(lines)):
-            line = lines[i]
-            if not line.strip():
-                continue
+    def _find_brace_block_end(self, content: str, line_starts: array, start: int) -> int:
+        """
+        Find end of brace-delimited block with one forward scan.
+
+        Braces inside string literals and comments are skipped, which the
+        old per-line brace counting got wrong. Instead of stepping the
+        interpreter over every character, the scan jumps between
+        state-changing characters with C-level search/find calls, so runs
+        of plain code, comment bodies, and string contents cost one call
+        each.
+        """
+        total = len(line_starts)
+        if start >= total:
+            return total
 
-            current_indent = len(line) - len(line.lstrip())
-            if current_indent <= base_indent and line.strip():
-                return i
+        depth = 0
+        found_start = False
+        i = line_starts[start]
+        end = len(content)
+
+        while i < end:
+            match = _BRACE_SCAN_RE.search(content, i)
+            if match is None:
+                return total
+            i = match.start()
+            ch = content[i]
+
+            if ch == '{':
+                depth += 1
+                found_start = True
+            elif ch == '}':
+                depth -= 1
+                if found_start and depth == 0:
+                    return bisect.bisect_right(line_starts, i)
+            elif ch == '/':
+                if content.startswith('//', i):
+                    i = content.find('\n', i + 2)
+                    if i == -1:
+                        return total
+                elif content.startswith('/*', i):
+                    i = content.find('*/', i + 2)
+                    if i == -1:
+                        return total
+                    i += 1
+            else:
+                # String literal: hop between escapes until the closing
+                # quote, leaving i on the quote itself
+                j = i + 1
+                closing = -1
+                while j < end:
+                    quote_at = content.find(ch, j)
+                    if quote_at == -1:
+                        break
+                    escape_at = content.find('\\', j, quote_at)
+                    if escape_at == -1:
+                        closing = quote_at
+                        break
+                    j = escape_at + 2
+                if closing == -1:
+                    return total
+                i = closing
 
-        return len(lines)
+            i += 1
 
-    def _find_brace_block_end(self, lines: List[str], start: int) -> int:
-        """Find end of brace-delimited block."""
-        brace_count = 0
-        found_start = False
+        return total
 
-        for i in range(start, len(lines)):
-            line = lines[i]
-            brace_count += line.count('{')
-            brace_count -= line.count('}')
 
-            if '{' in line:
-                found_start = True
+# Per-process analyzer for analyze_files workers, built once on first task
+_worker_analyzer = None
 
-            if found_start and brace_count == 0:
-                return i + 1
 
-        return len(lines)
+def _analyze_file_worker(spec: Tuple[str, str, str], languages_path: Optional[str] = None) -> Dict[str, Any]:
+    """Analyze one (file_path, content, language) spec in a worker process."""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = ASTAnalyzer(languages_path)
+    file_path, content, language = spec
+    return _worker_analyzer.analyze_file(file_path, content, language)
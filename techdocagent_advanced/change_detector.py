@@ -1,9 +1,35 @@
 import os
+import re
 import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Set, Optional, Tuple
+from typing import Any, List, Dict, Set, Optional, Tuple
 from datetime import datetime
 
+# Import patterns compiled once at module scope; the line anchors use
+# [ \t]* so MULTILINE matches cannot swallow preceding blank lines
+_PY_FROM_IMPORT_RE = re.compile(r'^[ \t]*from\s+(\S+)\s+import', re.MULTILINE)
+_PY_IMPORT_RE = re.compile(r'^[ \t]*import\s+(\S+)', re.MULTILINE)
+_JS_FROM_RE = re.compile(r"from\s+['\"](.+?)['\"]")
+_JS_REQUIRE_RE = re.compile(r"require\(['\"](.+?)['\"]\)")
+_C_IMPORT_RE = re.compile(r'^[ \t]*(?:import|using|#include)\s+[<"]?(.+?)[>"]?;?$', re.MULTILINE)
+
+# Git status codes mapped to change types; unknown codes fall back to
+# 'modified' in _parse_git_status
+_GIT_STATUS_MAP = {
+    'M': 'modified',
+    'MM': 'modified',
+    'AM': 'modified',
+    'A': 'added',
+    'AA': 'added',
+    '??': 'added',
+    'D': 'deleted',
+    'DD': 'deleted',
+    'R': 'renamed',
+    'RM': 'renamed',
+}
+
 
 class ChangeDetector:
     """
@@ -16,17 +42,26 @@ class ChangeDetector:
     - Affected chunk identification
     """
 
-    def __init__(self, root_path: str, memory_manager=None):
+    def __init__(self, root_path: str, memory_manager=None, max_workers: Optional[int] = None):
         """
         Initialize change detector.
 
         Args:
             root_path: Root path of the codebase
             memory_manager: Optional MemoryManager instance for hash comparison
+            max_workers: Optional thread count for parallel hash scans
         """
         self.root_path = Path(root_path)
         self.memory_manager = memory_manager
+        self.max_workers = max_workers
         self.is_git_repo = self._check_git_repo()
+        # Stat signatures of files last confirmed unchanged, so repeat
+        # scans can skip reading and hashing them
+        self._stat_cache: Dict[str, Tuple[int, int]] = {}
+        # Import graph reused across impact calculations until a source
+        # file changes (keyed on the file set and newest mtime)
+        self._import_graph: Optional[Dict[str, Set[str]]] = None
+        self._import_graph_key = None
 
     def _check_git_repo(self) -> bool:
         """Check if the root path is a git repository."""
@@ -48,9 +83,9 @@ class ChangeDetector:
 
         try:
             if since_commit:
-                cmd = ["git", "diff", "--name-status", since_commit]
+                cmd = ["git", "diff", "--name-status", "-z", since_commit]
             else:
-                cmd = ["git", "status", "--porcelain"]
+                cmd = ["git", "status", "--porcelain", "-z"]
 
             result = subprocess.run(
                 cmd,
@@ -60,29 +95,46 @@ class ChangeDetector:
                 check=True
             )
 
+            # NUL-separated output: paths with spaces or tabs arrive as
+            # single tokens, with no quoting or column guessing to undo
             changes = []
-            for line in result.stdout.strip().split('\n'):
-                if not line:
-                    continue
+            tokens = result.stdout.split('\0')
 
-                if since_commit:
-                    parts = line.split('\t')
-                    if len(parts) >= 2:
-                        status, file_path = parts[0], parts[1]
-                        change_type = self._parse_git_status(status)
-                        changes.append({
-                            'file_path': str(self.root_path / file_path),
-                            'change_type': change_type
-                        })
-                else:
-                    parts = line.split(maxsplit=1)
-                    if len(parts) >= 2:
-                        status, file_path = parts[0], parts[1]
-                        change_type = self._parse_git_status(status)
-                        changes.append({
-                            'file_path': str(self.root_path / file_path),
-                            'change_type': change_type
-                        })
+            if since_commit:
+                i = 0
+                while i + 1 < len(tokens):
+                    status = tokens[i]
+                    if not status:
+                        i += 1
+                        continue
+                    if status[0] in ('R', 'C') and i + 2 < len(tokens):
+                        # Rename/copy records carry a score and two paths;
+                        # the second path is the current name
+                        file_path = tokens[i + 2]
+                        status = status[0]
+                        i += 3
+                    else:
+                        file_path = tokens[i + 1]
+                        i += 2
+                    changes.append({
+                        'file_path': str(self.root_path / file_path),
+                        'change_type': self._parse_git_status(status)
+                    })
+            else:
+                i = 0
+                while i < len(tokens):
+                    entry = tokens[i]
+                    i += 1
+                    if len(entry) < 4:
+                        continue
+                    status, file_path = entry[:2], entry[3:]
+                    if status[0] in ('R', 'C'):
+                        # The original path follows as its own token
+                        i += 1
+                    changes.append({
+                        'file_path': str(self.root_path / file_path),
+                        'change_type': self._parse_git_status(status)
+                    })
 
             return changes
 
@@ -100,17 +152,7 @@ class ChangeDetector:
         Returns:
             Change type ('modified', 'added', 'deleted')
         """
-        status = status.strip()
-        if status in ('M', 'MM', 'AM'):
-            return 'modified'
-        elif status in ('A', 'AA', '??'):
-            return 'added'
-        elif status in ('D', 'DD'):
-            return 'deleted'
-        elif status in ('R', 'RM'):
-            return 'renamed'
-        else:
-            return 'modified'
+        return _GIT_STATUS_MAP.get(status.strip(), 'modified')
 
     def get_changed_files_hash(self, file_paths: List[str]) -> List[Dict[str, str]]:
         """
@@ -125,39 +167,26 @@ class ChangeDetector:
         if not self.memory_manager:
             return []
 
-        changes = []
-
-        tracked_files = set(self.memory_manager.get_all_file_paths())
-
-        for file_path in file_paths:
-            if not os.path.exists(file_path):
-                if file_path in tracked_files:
-                    changes.append({
-                        'file_path': file_path,
-                        'change_type': 'deleted'
-                    })
-                continue
-
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-            except Exception as e:
-                print(f"Error reading {file_path}: {e}")
-                continue
-
-            if self.memory_manager.has_file_changed(file_path, content):
-                if file_path in tracked_files:
-                    change_type = 'modified'
-                else:
-                    change_type = 'added'
-
-                changes.append({
-                    'file_path': file_path,
-                    'change_type': change_type
-                })
+        # Preload stored hashes so worker threads compare against a plain
+        # dict instead of sharing the SQLite connection
+        stored_hashes = self.memory_manager.get_all_file_hashes()
+
+        if self.max_workers is not None and self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = executor.map(
+                    lambda file_path: self._check_file_hash(file_path, stored_hashes),
+                    file_paths
+                )
+                changes = [change for change in results if change is not None]
+        else:
+            changes = [
+                change for change in
+                (self._check_file_hash(file_path, stored_hashes) for file_path in file_paths)
+                if change is not None
+            ]
 
         current_files = set(file_paths)
-        for tracked_file in tracked_files:
+        for tracked_file in stored_hashes:
             if tracked_file not in current_files:
                 changes.append({
                     'file_path': tracked_file,
@@ -166,6 +195,56 @@ class ChangeDetector:
 
         return changes
 
+    def _check_file_hash(self, file_path: str, stored_hashes: Dict[str, str]) -> Optional[Dict[str, str]]:
+        """
+        Check a single file against its stored hash.
+
+        Args:
+            file_path: Path to check
+            stored_hashes: Mapping of tracked paths to stored content hashes
+
+        Returns:
+            Change dictionary, or None if the file is unchanged
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            self._stat_cache.pop(file_path, None)
+            if file_path in stored_hashes:
+                return {
+                    'file_path': file_path,
+                    'change_type': 'deleted'
+                }
+            return None
+
+        # Unchanged mtime and size means the content hash would
+        # match too, so skip the read entirely
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if self._stat_cache.get(file_path) == signature:
+            return None
+
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
+        except Exception as e:
+            print(f"Error reading {file_path}: {e}")
+            return None
+
+        stored = stored_hashes.get(file_path)
+        if stored is None:
+            return {
+                'file_path': file_path,
+                'change_type': 'added'
+            }
+        if self.memory_manager.compute_file_hash(content) != stored:
+            return {
+                'file_path': file_path,
+                'change_type': 'modified'
+            }
+
+        self._stat_cache[file_path] = signature
+        return None
+
     def get_all_changes(self, file_paths: List[str], since_commit: Optional[str] = None) -> List[Dict[str, str]]:
         """
         Get all changes using both git and hash comparison.
@@ -228,6 +307,17 @@ class ChangeDetector:
         Returns:
             List of dependent file paths
         """
+        return self._find_dependencies_indexed(file_path, self._build_stem_index(all_files))
+
+    def _build_stem_index(self, all_files: List[str]) -> Dict[str, List[str]]:
+        """Map file stems to their paths for O(1) import resolution."""
+        index = {}
+        for other_file in all_files:
+            index.setdefault(Path(other_file).stem, []).append(other_file)
+        return index
+
+    def _find_dependencies_indexed(self, file_path: str, stem_index: Dict[str, List[str]]) -> List[str]:
+        """Resolve a file's imports against a prebuilt stem index."""
         dependencies = []
 
         try:
@@ -236,15 +326,59 @@ class ChangeDetector:
         except Exception:
             return dependencies
 
-        import_patterns = self._extract_imports(content, file_path)
-
-        for pattern in import_patterns:
-            for other_file in all_files:
-                if pattern in other_file or Path(other_file).stem == pattern:
-                    dependencies.append(other_file)
+        seen = set()
+        for pattern in self._extract_imports(content, file_path):
+            candidates = stem_index.get(pattern)
+            if candidates is None and '.' in pattern:
+                # Dotted import: try each component, outermost first
+                for part in pattern.split('.'):
+                    candidates = stem_index.get(part)
+                    if candidates:
+                        break
+            if candidates is None and '/' in pattern:
+                # Relative path import: match on the basename
+                candidates = stem_index.get(Path(pattern).stem)
+
+            for dep in candidates or ():
+                if dep not in seen:
+                    seen.add(dep)
+                    dependencies.append(dep)
 
         return dependencies
 
+    def _build_import_graph(self, all_files: List[str]) -> Dict[str, Set[str]]:
+        """
+        Build the import adjacency of the codebase, parsing each file once.
+
+        The graph is cached on the instance and reused while the file set
+        and its newest mtime are unchanged.
+
+        Args:
+            all_files: List of all files in codebase
+
+        Returns:
+            Mapping of file path to the set of files it imports
+        """
+        newest = 0
+        for file_path in all_files:
+            try:
+                newest = max(newest, os.stat(file_path).st_mtime_ns)
+            except OSError:
+                continue
+        key = (tuple(sorted(all_files)), newest)
+
+        if self._import_graph is not None and self._import_graph_key == key:
+            return self._import_graph
+
+        stem_index = self._build_stem_index(all_files)
+        graph = {
+            file_path: set(self._find_dependencies_indexed(file_path, stem_index))
+            for file_path in all_files
+        }
+        self._import_graph = graph
+        self._import_graph_key = key
+        return graph
+
     def _extract_imports(self, content: str, file_path: str) -> List[str]:
         """
         Extract import statements from code.
@@ -259,34 +393,21 @@ class ChangeDetector:
         imports = []
         ext = Path(file_path).suffix.lower()
 
-        lines = content.split('\n')
-
         if ext == '.py':
-            import re
-            for line in lines:
-                match = re.match(r'^\s*from\s+(\S+)\s+import', line)
-                if match:
-                    imports.append(match.group(1))
-                match = re.match(r'^\s*import\s+(\S+)', line)
-                if match:
-                    imports.append(match.group(1).split('.')[0])
+            for match in _PY_FROM_IMPORT_RE.finditer(content):
+                imports.append(match.group(1))
+            for match in _PY_IMPORT_RE.finditer(content):
+                imports.append(match.group(1).split('.')[0])
 
         elif ext in ('.js', '.ts'):
-            import re
-            for line in lines:
-                match = re.search(r"from\s+['\"](.+?)['\"]", line)
-                if match:
-                    imports.append(match.group(1))
-                match = re.search(r"require\(['\"](.+?)['\"]\)", line)
-                if match:
-                    imports.append(match.group(1))
+            for match in _JS_FROM_RE.finditer(content):
+                imports.append(match.group(1))
+            for match in _JS_REQUIRE_RE.finditer(content):
+                imports.append(match.group(1))
 
         elif ext in ('.java', '.cpp', '.c', '.cs'):
-            import re
-            for line in lines:
-                match = re.search(r'^\s*(?:import|using|#include)\s+[<"]?(.+?)[>"]?;?$', line)
-                if match:
-                    imports.append(match.group(1))
+            for match in _C_IMPORT_RE.finditer(content):
+                imports.append(match.group(1))
 
         return imports
 
@@ -312,19 +433,45 @@ class ChangeDetector:
             change_type = change['change_type']
             impact['change_types'][change_type] = impact['change_types'].get(change_type, 0) + 1
 
+        graph = self._build_import_graph(all_files)
+        stem_index = self._build_stem_index(all_files)
+
+        extra: Dict[str, Set[str]] = {}
+
+        def dependencies_of(file_path: str) -> Set[str]:
+            deps = graph.get(file_path)
+            if deps is None:
+                # Changed file outside the indexed set; resolve it directly
+                # without polluting the cached graph
+                deps = extra.get(file_path)
+                if deps is None:
+                    deps = set(self._find_dependencies_indexed(file_path, stem_index))
+                    extra[file_path] = deps
+            return deps
+
+        # Single BFS over the import graph from the changed set, so each
+        # file is visited once no matter how many changes reach it
+        affected = impact['affected_files']
+        queue = deque()
         for change in changed_files:
             file_path = change['file_path']
-            impact['affected_files'].add(file_path)
-
-            deps = self.find_dependencies(file_path, all_files)
-            impact['affected_files'].update(deps)
+            if file_path not in affected:
+                affected.add(file_path)
+                queue.append(file_path)
 
+            deps = dependencies_of(file_path)
             if len(deps) > 5:
                 impact['high_impact_files'].append({
                     'file': file_path,
                     'dependency_count': len(deps)
                 })
 
+        while queue:
+            for dep in dependencies_of(queue.popleft()):
+                if dep not in affected:
+                    affected.add(dep)
+                    queue.append(dep)
+
         impact['total_affected_files'] = len(impact['affected_files'])
         impact['affected_files'] = list(impact['affected_files'])
 
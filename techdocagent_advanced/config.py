@@ -1,11 +1,29 @@
+import functools
 import os
 import json
 from pathlib import Path
 from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, asdict, field
-
-
-@dataclass
+from dataclasses import dataclass, field
+
+# Standard config file locations, in lookup order
+_POSSIBLE_CONFIG_PATHS = (
+    '.techdocagent.json',
+    '.techdocagent.yaml',
+    '.techdocagent.yml',
+    'techdocagent.json',
+    'config/techdocagent.json',
+)
+
+# Environment variables and the config fields they override
+_ENV_MAP = (
+    ('GEMINI_API_KEY', 'gemini_api_key'),
+    ('TECHDOC_OUTPUT_DIR', 'output_dir'),
+    ('TECHDOC_PROJECT_ROOT', 'project_root'),
+    ('TECHDOC_LOG_LEVEL', 'log_level'),
+)
+
+
+@dataclass(slots=True)
 class AgentConfig:
     """Main configuration for TechDocAgent Advanced."""
 
@@ -39,6 +57,7 @@ class AgentConfig:
     use_embeddings: bool = True
     max_chunk_size: int = 1000
     min_chunk_size: int = 10
+    max_file_bytes: int = 1024 * 1024
 
     enable_change_detection: bool = True
     use_git_tracking: bool = True
@@ -53,6 +72,7 @@ class AgentConfig:
     top_k: int = 40
 
     batch_size: int = 10
+    embed_batch_size: int = 100
     parallel_processing: bool = True
     max_workers: int = 4
 
@@ -70,8 +90,8 @@ class AgentConfig:
     })
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert config to dictionary."""
-        return asdict(self)
+        """Convert config to a shallow dictionary of its fields."""
+        return {name: getattr(self, name) for name in self.__dataclass_fields__}
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'AgentConfig':
@@ -109,6 +129,28 @@ class AgentConfig:
         return errors
 
 
+@functools.lru_cache(maxsize=1)
+def _discover_config_file() -> Optional[str]:
+    """
+    Find a configuration file in the standard locations.
+
+    One os.scandir of the working directory answers the filename checks
+    with a single syscall; only the config/ candidate needs its own
+    lookup. The result is cached for the life of the process — pass an
+    explicit config_path to ConfigManager to override it.
+    """
+    try:
+        names = {entry.name for entry in os.scandir('.')}
+    except OSError:
+        names = set()
+
+    for path in _POSSIBLE_CONFIG_PATHS:
+        if path in names or (os.sep in path and os.path.exists(path)):
+            return path
+
+    return None
+
+
 class ConfigManager:
     """
     Manages configuration loading, saving, and validation.
@@ -121,7 +163,7 @@ class ConfigManager:
         Args:
             config_path: Path to config file (optional)
         """
-        self.config_path = config_path or self._find_config_file()
+        self.config_path = config_path or _discover_config_file()
         self.config: AgentConfig = AgentConfig()
 
         if self.config_path and os.path.exists(self.config_path):
@@ -129,22 +171,6 @@ class ConfigManager:
         else:
             self._load_from_env()
 
-    def _find_config_file(self) -> Optional[str]:
-        """Find configuration file in standard locations."""
-        possible_paths = [
-            '.techdocagent.json',
-            '.techdocagent.yaml',
-            '.techdocagent.yml',
-            'techdocagent.json',
-            'config/techdocagent.json',
-        ]
-
-        for path in possible_paths:
-            if os.path.exists(path):
-                return path
-
-        return None
-
     def load(self, config_path: Optional[str] = None) -> AgentConfig:
         """
         Load configuration from file.
@@ -192,17 +218,10 @@ class ConfigManager:
     def _load_from_env(self):
         """Load configuration from environment variables."""
 
-        if os.getenv('GEMINI_API_KEY'):
-            self.config.gemini_api_key = os.getenv('GEMINI_API_KEY')
-
-        if os.getenv('TECHDOC_OUTPUT_DIR'):
-            self.config.output_dir = os.getenv('TECHDOC_OUTPUT_DIR')
-
-        if os.getenv('TECHDOC_PROJECT_ROOT'):
-            self.config.project_root = os.getenv('TECHDOC_PROJECT_ROOT')
-
-        if os.getenv('TECHDOC_LOG_LEVEL'):
-            self.config.log_level = os.getenv('TECHDOC_LOG_LEVEL')
+        for env_var, field_name in _ENV_MAP:
+            value = os.environ.get(env_var)
+            if value:
+                setattr(self.config, field_name, value)
 
     def save(self, config_path: Optional[str] = None):
         """
@@ -1,5 +1,18 @@
+import functools
+import re
 from typing import Dict, List, Optional, Any
 
+_PLACEHOLDER_RE = re.compile(r'\{(\w+)\}')
+
+
+@functools.lru_cache(maxsize=32)
+def _split_template(template: str):
+    """
+    Split a template into alternating literal segments and placeholder keys,
+    cached per template so repeated fills skip the parse entirely.
+    """
+    return _PLACEHOLDER_RE.split(template)
+
 
 class DocTemplates:
     """
@@ -437,15 +450,14 @@ Format as Markdown with clear, actionable steps.
         Returns:
             Filled template
         """
-        try:
-            return template.format(**context)
-        except KeyError as e:
-            print(f"Warning: Missing template variable {e}")
-            # Fill missing variables with placeholders
-            import re
-            def replace_missing(match):
-                key = match.group(1)
-                return context.get(key, f"[{key} not provided]")
-
-            pattern = r'\{([^}]+)\}'
-            return re.sub(pattern, replace_missing, template)
+        # The template is pre-split once (cached); filling is a join over the
+        # segments with no per-call format parsing or KeyError branch
+        parts = _split_template(template)
+        filled = []
+        for i, part in enumerate(parts):
+            if i % 2:
+                value = context.get(part, f"[{part} not provided]")
+                filled.append(value if isinstance(value, str) else str(value))
+            else:
+                filled.append(part)
+        return ''.join(filled)
@@ -1,6 +1,8 @@
 import os
 import pickle
 import numpy as np
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple, Any
 import google.generativeai as genai
@@ -44,10 +46,17 @@ class EmbeddingManager:
         self.dimension = 768 
 
         self.index = None
-        self.chunks = [] 
+        self.chunks = []
         self.chunk_embeddings = []
 
+        # Languages encoded as small ints so tallies run as one C-level
+        # bincount instead of a Python dict increment per chunk
+        self.lang_to_id: Dict[str, int] = {}
+        self.id_to_lang: List[str] = []
+        self.lang_ids: List[int] = []
+
         self._load_or_create_index()
+        self._rebuild_lang_ids()
 
     def _load_or_create_index(self):
         """Load existing FAISS index or create a new one."""
@@ -61,6 +70,13 @@ class EmbeddingManager:
                     data = pickle.load(f)
                     self.chunks = data['chunks']
                     self.chunk_embeddings = data['embeddings']
+                if self.index.metric_type != faiss.METRIC_INNER_PRODUCT:
+                    # Older on-disk L2 index: rebuild as inner-product over
+                    # normalized vectors so search scores stay cosines
+                    self.chunk_embeddings = [self._normalize(e) for e in self.chunk_embeddings]
+                    self.index = faiss.IndexFlatIP(self.dimension)
+                    if self.chunk_embeddings:
+                        self.index.add(np.stack(self.chunk_embeddings))
                 print(f"Loaded existing index with {len(self.chunks)} chunks")
             except Exception as e:
                 print(f"Error loading index: {e}. Creating new index.")
@@ -71,12 +87,38 @@ class EmbeddingManager:
     def _create_new_index(self):
         """Create a new FAISS index."""
         if FAISS_AVAILABLE:
-            self.index = faiss.IndexFlatL2(self.dimension)
+            # Inner product over vectors normalized at insert time: search is
+            # a raw dot product and the scores are cosines
+            self.index = faiss.IndexFlatIP(self.dimension)
             print("Created new FAISS index")
         else:
             print("FAISS not available - using simple list-based search")
         self.chunks = []
         self.chunk_embeddings = []
+        self.lang_to_id = {}
+        self.id_to_lang = []
+        self.lang_ids = []
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        """L2-normalize an embedding as float32."""
+        embedding = np.asarray(embedding, dtype=np.float32)
+        return embedding / (np.linalg.norm(embedding) + 1e-12)
+
+    def _lang_id(self, language: str) -> int:
+        """Return the integer id for a language, assigning one on first sight."""
+        lang_id = self.lang_to_id.get(language)
+        if lang_id is None:
+            lang_id = len(self.id_to_lang)
+            self.lang_to_id[language] = lang_id
+            self.id_to_lang.append(language)
+        return lang_id
+
+    def _rebuild_lang_ids(self):
+        """Recompute the language-id array from chunk metadata (e.g. after load)."""
+        self.lang_to_id = {}
+        self.id_to_lang = []
+        self.lang_ids = [self._lang_id(chunk.get('language', 'Unknown')) for chunk in self.chunks]
 
     def generate_embedding(self, text: str) -> Optional[np.ndarray]:
         """
@@ -104,6 +146,31 @@ class EmbeddingManager:
             print(f"Error generating embedding: {e}")
             return None
 
+    def generate_embeddings_batch(self, texts: List[str]) -> Optional[List[np.ndarray]]:
+        """
+        Generate embeddings for many texts in a single API request.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List of numpy arrays (one per text) or None on error
+        """
+        if not self.api_key:
+            print("Warning: No API key provided. Cannot generate embeddings.")
+            return None
+
+        try:
+            result = genai.embed_content(
+                model=self.embedding_model,
+                content=texts,
+                task_type="retrieval_document"
+            )
+            return [np.array(e, dtype='float32') for e in result['embedding']]
+        except Exception as e:
+            print(f"Error generating batch embeddings: {e}")
+            return None
+
     def generate_query_embedding(self, query: str) -> Optional[np.ndarray]:
         """
         Generate embedding for a search query.
@@ -129,6 +196,30 @@ class EmbeddingManager:
             print(f"Error generating query embedding: {e}")
             return None
 
+    def generate_query_embeddings_batch(self, queries: List[str]) -> Optional[List[np.ndarray]]:
+        """
+        Generate embeddings for many search queries in a single API request.
+
+        Args:
+            queries: Query texts
+
+        Returns:
+            List of numpy arrays (one per query) or None on error
+        """
+        if not self.api_key:
+            return None
+
+        try:
+            result = genai.embed_content(
+                model=self.embedding_model,
+                content=queries,
+                task_type="retrieval_query"
+            )
+            return [np.array(e, dtype='float32') for e in result['embedding']]
+        except Exception as e:
+            print(f"Error generating query embeddings: {e}")
+            return None
+
     def add_chunk(self, chunk: Dict[str, Any], file_path: str, language: str) -> bool:
         """
         Add a code chunk to the index.
@@ -148,6 +239,70 @@ class EmbeddingManager:
         if embedding is None:
             return False
 
+        self._append_chunk(chunk, file_path, language, embedding)
+        return True
+
+    def add_chunks_batch(self, chunks: List[Dict[str, Any]], file_paths: List[str],
+                         languages: List[str], batch_size: int = 100) -> List[int]:
+        """
+        Add many code chunks to the index with batched embedding requests.
+
+        Embeds batch_size chunks per embed_content call instead of one, and
+        issues the batches concurrently on a thread pool since the calls are
+        network-bound.
+
+        Args:
+            chunks: Chunk dictionaries with code and metadata
+            file_paths: Source file path per chunk
+            languages: Programming language per chunk
+            batch_size: Chunks per embedding request (provider limit is 100)
+
+        Returns:
+            Input indices of the chunks successfully added, in index order
+        """
+        if not chunks:
+            return []
+
+        texts = [self._create_chunk_text(chunk, file_path, language)
+                 for chunk, file_path, language in zip(chunks, file_paths, languages)]
+        starts = range(0, len(texts), batch_size)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            batch_results = list(executor.map(
+                self.generate_embeddings_batch,
+                [texts[start:start + batch_size] for start in starts]
+            ))
+
+        added = []
+        for start, embeddings in zip(starts, batch_results):
+            if embeddings is None:
+                continue
+            for offset, embedding in enumerate(embeddings):
+                i = start + offset
+                self._append_chunk(chunks[i], file_paths[i], languages[i], embedding)
+                added.append(i)
+
+        return added
+
+    def add_chunk_embedding(self, chunk: Dict[str, Any], file_path: str, language: str,
+                            embedding: np.ndarray):
+        """
+        Add a chunk whose embedding was computed previously (e.g. served from
+        a persistent cache), skipping the embedding API entirely.
+
+        Args:
+            chunk: Chunk dictionary with code and metadata
+            file_path: Path to source file
+            language: Programming language
+            embedding: Precomputed embedding vector
+        """
+        self._append_chunk(chunk, file_path, language, embedding)
+
+    def _append_chunk(self, chunk: Dict[str, Any], file_path: str, language: str,
+                      embedding: np.ndarray):
+        """Record a chunk's metadata and embedding in the index."""
+        # Normalized once here so no per-search renormalization is needed
+        embedding = self._normalize(embedding)
+
         chunk_metadata = {
             'file_path': file_path,
             'language': language,
@@ -161,12 +316,11 @@ class EmbeddingManager:
 
         self.chunks.append(chunk_metadata)
         self.chunk_embeddings.append(embedding)
+        self.lang_ids.append(self._lang_id(language))
 
         if FAISS_AVAILABLE and self.index is not None:
             self.index.add(embedding.reshape(1, -1))
 
-        return True
-
     def _create_chunk_text(self, chunk: Dict, file_path: str, language: str) -> str:
         """
         Create a text representation of a chunk for embedding.
@@ -213,40 +367,75 @@ class EmbeddingManager:
             return self._keyword_search(query, top_k)
 
         if FAISS_AVAILABLE and self.index is not None and self.index.ntotal > 0:
-            
+
+            # Stored vectors are unit length, so only the query needs
+            # normalizing and the inner product is already the cosine
+            query_embedding = self._normalize(query_embedding)
             top_k = min(top_k, self.index.ntotal)
-            distances, indices = self.index.search(query_embedding.reshape(1, -1), top_k)
+            scores, indices = self.index.search(query_embedding.reshape(1, -1), top_k)
 
             results = []
-            for idx, dist in zip(indices[0], distances[0]):
+            for idx, score in zip(indices[0], scores[0]):
                 if idx < len(self.chunks):
-                    similarity = 1 / (1 + dist)
-                    results.append((self.chunks[idx], float(similarity)))
+                    results.append((self.chunks[idx], float(score)))
 
             return results
         else:
             return self._manual_search(query_embedding, top_k)
 
+    def search_batch(self, queries: List[str], top_k: int = 5) -> List[List[Tuple[Dict, float]]]:
+        """
+        Search for several queries at once: one batched embedding request and
+        one stacked FAISS search (a GEMM over the query matrix) instead of a
+        separate round-trip and GEMV per query.
+
+        Args:
+            queries: Search queries
+            top_k: Number of results per query
+
+        Returns:
+            One result list per query, in query order
+        """
+        if not self.chunks or not queries:
+            return [[] for _ in queries]
+
+        vectors = self.generate_query_embeddings_batch(queries)
+        if vectors is None:
+            return [self._keyword_search(query, top_k) for query in queries]
+
+        if FAISS_AVAILABLE and self.index is not None and self.index.ntotal > 0:
+            matrix = np.stack([self._normalize(vector) for vector in vectors])
+            top_k = min(top_k, self.index.ntotal)
+            scores, indices = self.index.search(matrix, top_k)
+
+            results = []
+            for row in range(len(queries)):
+                row_results = []
+                for idx, score in zip(indices[row], scores[row]):
+                    if idx < len(self.chunks):
+                        row_results.append((self.chunks[idx], float(score)))
+                results.append(row_results)
+            return results
+
+        return [self._manual_search(vector, top_k) for vector in vectors]
+
     def _manual_search(self, query_embedding: np.ndarray, top_k: int) -> List[Tuple[Dict, float]]:
         """Manual similarity search without FAISS."""
         if not self.chunk_embeddings:
             return []
 
-        similarities = []
-        for idx, chunk_emb in enumerate(self.chunk_embeddings):
-
-            similarity = np.dot(query_embedding, chunk_emb) / (
-                np.linalg.norm(query_embedding) * np.linalg.norm(chunk_emb)
-            )
-            similarities.append((idx, float(similarity)))
+        # One BLAS matmul over the stacked matrix instead of a Python-level
+        # dot product and norm per chunk, then partial sort for the top k
+        matrix = np.stack(self.chunk_embeddings)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query_embedding)
+        norms[norms == 0] = 1.0
+        similarities = (matrix @ query_embedding) / norms
 
-        similarities.sort(key=lambda x: x[1], reverse=True)
-
-        results = []
-        for idx, sim in similarities[:top_k]:
-            results.append((self.chunks[idx], sim))
+        top_k = min(top_k, len(similarities))
+        top = np.argpartition(similarities, -top_k)[-top_k:]
+        top = top[np.argsort(similarities[top])[::-1]]
 
-        return results
+        return [(self.chunks[int(idx)], float(similarities[idx])) for idx in top]
 
     def _keyword_search(self, query: str, top_k: int) -> List[Tuple[Dict, float]]:
         """Fallback keyword-based search."""
@@ -348,19 +537,11 @@ class EmbeddingManager:
             'index_size': self.index.ntotal if FAISS_AVAILABLE and self.index else 0,
         }
 
-        languages = {}
-        for chunk in self.chunks:
-            lang = chunk.get('language', 'Unknown')
-            languages[lang] = languages.get(lang, 0) + 1
-
-        stats['languages'] = languages
-
-        types = {}
-        for chunk in self.chunks:
-            chunk_type = chunk.get('chunk_type', 'unknown')
-            types[chunk_type] = types.get(chunk_type, 0) + 1
-
-        stats['chunk_types'] = types
+        # Counter consumes the generators at C level, one pass per tally
+        stats['languages'] = dict(Counter(
+            chunk.get('language', 'Unknown') for chunk in self.chunks))
+        stats['chunk_types'] = dict(Counter(
+            chunk.get('chunk_type', 'unknown') for chunk in self.chunks))
 
         return stats
 
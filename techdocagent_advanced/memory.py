@@ -5,6 +5,12 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
 
 class MemoryManager:
     """
@@ -25,10 +31,37 @@ class MemoryManager:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        # check_same_thread=False lets worker threads store metadata; callers
+        # serialize writes (SQLite connections are not concurrency-safe)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
+        # WAL amortizes fsync across writers; NORMAL sync is safe under WAL
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self._bulk = False
         self._initialize_schema()
 
+    def begin_bulk(self):
+        """
+        Start a bulk write transaction: per-call commits are suppressed until
+        commit_bulk, so a whole analysis run costs one fsync instead of one
+        per row.
+        """
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN IMMEDIATE")
+        self._bulk = True
+
+    def commit_bulk(self):
+        """Commit a bulk transaction started with begin_bulk."""
+        self._bulk = False
+        self.conn.commit()
+
+    def _maybe_commit(self):
+        """Commit unless a bulk transaction is open."""
+        if not self._bulk:
+            self.conn.commit()
+
     def _initialize_schema(self):
         """Create database tables if they don't exist."""
         cursor = self.conn.cursor()
@@ -79,6 +112,31 @@ class MemoryManager:
             )
         """)
 
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS chunk_occurrences (
+                content_hash BLOB NOT NULL,
+                file_path TEXT NOT NULL,
+                PRIMARY KEY (content_hash, file_path)
+            )
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                content_hash BLOB PRIMARY KEY,
+                vector BLOB NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                prompt_embedding BLOB NOT NULL,
+                response TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS changes (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -94,8 +152,17 @@ class MemoryManager:
         self.conn.commit()
 
     def compute_file_hash(self, content: str) -> str:
-        """Compute SHA256 hash of file content."""
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+        """
+        Compute a content hash for change detection.
+
+        This is a fingerprint, not a security primitive: xxhash (when
+        installed) or blake2b is used instead of SHA256 because both are
+        several times faster on large files.
+        """
+        data = content.encode('utf-8')
+        if XXHASH_AVAILABLE:
+            return xxhash.xxh3_64_hexdigest(data)
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
 
     def store_file_metadata(self, file_path: str, content: str, language: str, metadata: Optional[Dict] = None):
         """
@@ -121,7 +188,7 @@ class MemoryManager:
                 metadata = excluded.metadata
         """, (file_path, content_hash, language, metadata_json))
 
-        self.conn.commit()
+        self._maybe_commit()
 
     def get_file_metadata(self, file_path: str) -> Optional[Dict]:
         """
@@ -290,6 +357,108 @@ class MemoryManager:
         row = cursor.fetchone()
         return dict(row) if row else {}
 
+    def link_chunk_to_file(self, content_hash: bytes, file_path: str):
+        """
+        Record that a chunk's content occurs in a file; duplicated content
+        (license headers, vendored copies) keeps one vector with many
+        occurrence rows.
+
+        Args:
+            content_hash: Digest of the chunk code
+            file_path: File containing the chunk
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            INSERT OR IGNORE INTO chunk_occurrences (content_hash, file_path)
+            VALUES (?, ?)
+        """, (content_hash, file_path))
+        self._maybe_commit()
+
+    def get_chunk_occurrences(self, content_hash: bytes) -> List[str]:
+        """
+        Get all files containing a chunk's content.
+
+        Args:
+            content_hash: Digest of the chunk code
+
+        Returns:
+            List of file paths
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT file_path FROM chunk_occurrences WHERE content_hash = ?", (content_hash,))
+        return [row[0] for row in cursor.fetchall()]
+
+    def get_cached_embedding(self, content_hash: bytes) -> Optional[bytes]:
+        """
+        Retrieve a cached embedding vector for a chunk content hash.
+
+        Args:
+            content_hash: Digest of the chunk code
+
+        Returns:
+            Serialized embedding vector or None if not cached
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT vector FROM embedding_cache WHERE content_hash = ?", (content_hash,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def put_cached_embedding(self, content_hash: bytes, vector_blob: bytes):
+        """
+        Store an embedding vector keyed by chunk content hash.
+
+        Args:
+            content_hash: Digest of the chunk code
+            vector_blob: Serialized embedding vector
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            INSERT OR REPLACE INTO embedding_cache (content_hash, vector)
+            VALUES (?, ?)
+        """, (content_hash, vector_blob))
+        self._maybe_commit()
+
+    def get_llm_cache(self, max_age_seconds: int = 3600) -> List[Dict]:
+        """
+        Retrieve non-expired LLM cache entries.
+
+        Args:
+            max_age_seconds: Entries older than this are ignored
+
+        Returns:
+            List of dictionaries with prompt_embedding blob and response
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT prompt_embedding, response FROM llm_cache
+            WHERE created_at >= datetime('now', '-' || ? || ' seconds')
+        """, (max_age_seconds,))
+        return [dict(row) for row in cursor.fetchall()]
+
+    def put_llm_cache(self, prompt_embedding: bytes, response: str, max_entries: int = 1000):
+        """
+        Store an LLM prompt embedding and its response, evicting the oldest
+        entries beyond max_entries.
+
+        Args:
+            prompt_embedding: Serialized prompt embedding vector
+            response: LLM response text
+            max_entries: Maximum cache entries to retain
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            INSERT INTO llm_cache (prompt_embedding, response)
+            VALUES (?, ?)
+        """, (prompt_embedding, response))
+
+        cursor.execute("""
+            DELETE FROM llm_cache WHERE id NOT IN (
+                SELECT id FROM llm_cache ORDER BY id DESC LIMIT ?
+            )
+        """, (max_entries,))
+
+        self.conn.commit()
+
     def track_change(self, file_path: str, old_hash: Optional[str], new_hash: str,
                     change_type: str, metadata: Optional[Dict] = None):
         """
@@ -375,6 +544,12 @@ class MemoryManager:
         cursor.execute("SELECT file_path FROM files")
         return [row[0] for row in cursor.fetchall()]
 
+    def get_all_file_hashes(self) -> Dict[str, str]:
+        """Get stored content hashes for all tracked files."""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT file_path, content_hash FROM files")
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
     def clear_old_data(self, days: int = 30):
         """
         Clear old data from the database.